@@ -0,0 +1,298 @@
+"""
+Benchmarks de los caminos críticos del controlador, el estado y el renderizado
+
+Uso:
+    python -m benchmarks.run                       # mostrar resultados
+    python -m benchmarks.run --save base.json      # guardar como JSON
+    python -m benchmarks.run --compare base.json   # comparar contra una base
+
+Cada resultado es el tiempo por llamada en microsegundos (el mínimo de
+varias repeticiones). Al comparar, el proceso termina con código 1 si algún
+benchmark es más lento que la base por encima del umbral.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from timeit import Timer
+from controllers.game_controller import GameController
+from models.deck import Deck
+from simulation.engine import run_simulation
+from ui.canvas_backend import RecordingCanvas
+from ui.pile_renderer import PileRenderer
+from utils.constants import CENTER_PILE
+
+REPEAT = 5
+DEFAULT_THRESHOLD = 0.10
+
+
+def time_per_call(statement, number, repeat=REPEAT):
+    """
+    Mide una función sin argumentos
+
+    Args:
+        statement: Función a medir
+        number (int): Llamadas por repetición
+        repeat (int): Repeticiones
+
+    Returns:
+        float: Microsegundos por llamada (mejor repetición)
+    """
+    return min(Timer(statement).repeat(repeat, number)) / number * 1e6
+
+
+def bench_deck(number):
+    """Benchmarks de Deck"""
+    deck = Deck(random.Random(1))
+    return {
+        'deck.initialize': time_per_call(deck.initialize, number),
+        'deck.shuffle': time_per_call(deck.shuffle, number),
+        'deck.distribute_to_piles': time_per_call(deck.distribute_to_piles, number),
+    }
+
+
+def play_timed_games(num_games, seed=1):
+    """
+    Juega partidas midiendo cada llamada del controlador
+
+    Args:
+        num_games (int): Partidas a jugar
+        seed (int): Semilla de la mezcla
+
+    Returns:
+        tuple: (tiempos acumulados por operación, llamadas, controladores finales)
+    """
+    clock = time.perf_counter
+    totals = {'flip_card': 0.0, 'place_card': 0.0, 'get_next_card_to_flip': 0.0}
+    calls = dict.fromkeys(totals, 0)
+    finished = []
+    rng = random.Random(seed)
+
+    for _ in range(num_games):
+        controller = GameController(rng)
+        controller.start_game("benchmark")
+        start = clock()
+        controller.flip_card(12, 0)
+        totals['flip_card'] += clock() - start
+        calls['flip_card'] += 1
+        while True:
+            target = controller.state.selected_card.num_value - 1
+            start = clock()
+            controller.place_card(target)
+            totals['place_card'] += clock() - start
+            calls['place_card'] += 1
+            if controller.check_game_over(target):
+                break
+            start = clock()
+            card_index = controller.get_next_card_to_flip(target)
+            totals['get_next_card_to_flip'] += clock() - start
+            calls['get_next_card_to_flip'] += 1
+            start = clock()
+            controller.flip_card(target, card_index)
+            totals['flip_card'] += clock() - start
+            calls['flip_card'] += 1
+        finished.append(controller)
+    return totals, calls, finished
+
+
+def bench_controller(num_games):
+    """Benchmarks de GameController y GameState"""
+    # Costo de la propia medición, para descontarlo
+    clock = time.perf_counter
+    overhead = min(Timer(lambda: clock() - clock()).repeat(REPEAT, 10000)) / 10000
+
+    totals, calls, finished = play_timed_games(num_games)
+    results = {
+        f'controller.{name}': max(totals[name] / calls[name] - overhead, 0.0) * 1e6
+        for name in totals
+    }
+
+    # Reinicio y nueva partida reutilizando cartas, pilas y estado
+    controller = GameController(random.Random(5))
+
+    def reset_and_start():
+        controller.reset()
+        controller.start_game("benchmark")
+
+    results['controller.reset_and_start'] = time_per_call(reset_and_start, num_games)
+
+    # check_victory sobre tableros terminados (recorre todas las cartas)
+    states = [controller.state for controller in finished]
+    results['state.check_victory'] = time_per_call(
+        lambda: [state.check_victory() for state in states], 1) / len(states)
+
+    # Fotos del estado y vuelta entre el inicio y el final de una partida
+    controller.reset()
+    controller.start_game("benchmark")
+    controller.flip_card(CENTER_PILE, 0)
+    start = controller.state.snapshot()
+    controller.auto_complete()
+    end = controller.state.snapshot()
+    results['state.snapshot'] = time_per_call(controller.state.snapshot, num_games)
+
+    def restore_round_trip():
+        controller.state.restore(start)
+        controller.state.restore(end)
+
+    results['state.restore_full_game'] = time_per_call(restore_round_trip, num_games) / 2
+    return results
+
+
+def bench_renderer(number):
+    """Benchmarks de PileRenderer contra el canvas sin pantalla"""
+    controller = GameController(random.Random(2))
+    controller.start_game("benchmark")
+    controller.flip_card(12, 0)
+    piles = controller.state.piles
+    selected = controller.state.selected_card
+    renderer = PileRenderer(RecordingCanvas(record=False))
+
+    def full_pass():
+        renderer.reset()
+        renderer.draw_all_piles(piles, selected)
+
+    def unchanged_pass():
+        renderer.draw_all_piles(piles, selected)
+
+    # Pilas de 16 cartas (cuatro barajas): se dibujan con nivel de detalle reducido
+    deck = Deck(random.Random(3))
+    deck.cards = [card for _ in range(4) for card in deck.pool]
+    deep_piles = deck.distribute_to_piles(cards_per_pile=16)
+    deep_renderer = PileRenderer(RecordingCanvas(record=False))
+
+    def deep_full_pass():
+        deep_renderer.reset()
+        deep_renderer.draw_all_piles(deep_piles)
+
+    return {
+        'renderer.draw_all_piles.full': time_per_call(full_pass, number),
+        'renderer.draw_all_piles.unchanged': time_per_call(unchanged_pass, number),
+        'renderer.draw_all_piles.deep_full': time_per_call(deep_full_pass, number),
+    }
+
+
+def bench_end_to_end(num_games):
+    """Partidas completas por segundo (en microsegundos por partida)"""
+    def controller_games():
+        play_timed_games(num_games, seed=3)
+
+    # Respuestas sin tablero: la repartición se juega sobre las pilas compactas
+    compact_controller = GameController(random.Random(3))
+
+    def compact_games():
+        for _ in range(num_games):
+            compact_controller.reset()
+            compact_controller.start_game("benchmark")
+            compact_controller.answer()
+
+    return {
+        'games.controller': time_per_call(controller_games, 1, repeat=3) / num_games,
+        'games.compact': time_per_call(compact_games, 1, repeat=3) / num_games,
+        'games.engine': time_per_call(
+            lambda: run_simulation(num_games * 10, random.Random(4)), 1, repeat=3) / (num_games * 10),
+    }
+
+
+def bench_cli(repeat):
+    """Arranque en frío de la línea de comandos, descontando el del intérprete"""
+    def cold_start(command):
+        def run():
+            subprocess.run([sys.executable, *command], check=False, capture_output=True)
+        return time_per_call(run, 1, repeat=repeat)
+
+    baseline = cold_start(["-c", "pass"])
+    return {
+        'cli.cold_start': cold_start(["-m", "cli", "ask", "benchmark", "--seed", "1"]) - baseline,
+    }
+
+
+def run_all(quick=False):
+    """
+    Ejecuta todos los benchmarks
+
+    Args:
+        quick (bool): Usar menos iteraciones
+
+    Returns:
+        dict: Microsegundos por llamada de cada benchmark
+    """
+    scale = 1 if quick else 5
+    results = {}
+    results.update(bench_deck(200 * scale))
+    results.update(bench_controller(200 * scale))
+    results.update(bench_renderer(20 * scale))
+    results.update(bench_end_to_end(100 * scale))
+    results.update(bench_cli(3 * scale))
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compara resultados contra una base
+
+    Args:
+        results (dict): Resultados actuales
+        baseline (dict): Resultados de la base
+        threshold (float): Aumento relativo tolerado
+
+    Returns:
+        list: Lista de (nombre, base, actual, cambio relativo) de las regresiones
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        change = current / previous - 1
+        if change > threshold:
+            regressions.append((name, previous, current, change))
+    return regressions
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmarks del Oráculo de Cartas")
+    parser.add_argument("--save", help="guardar los resultados en este JSON")
+    parser.add_argument("--compare", help="JSON base contra el cual comparar")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="aumento relativo tolerado (por defecto 0.10)")
+    parser.add_argument("--quick", action="store_true", help="menos iteraciones")
+    args = parser.parse_args(argv)
+
+    results = run_all(args.quick)
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)['results']
+
+    for name, value in results.items():
+        line = f"{name:40s} {value:12.3f} us"
+        if name in baseline and baseline[name]:
+            line += f"  ({value / baseline[name] - 1:+.1%})"
+        print(line)
+
+    if args.save:
+        report = {
+            'meta': {
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'machine': platform.machine(),
+                'timestamp': time.time(),
+            },
+            'unit': 'us_per_call',
+            'results': results,
+        }
+        with open(args.save, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2, sort_keys=True)
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, previous, current, change in regressions:
+        print(f"REGRESIÓN {name}: {previous:.3f} -> {current:.3f} us ({change:+.1%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Oráculo de Cartas por línea de comandos, sin pantalla
+
+Uso:
+    python -m cli ask "¿Me irá bien?"            # responder una pregunta
+    python -m cli ask "..." --by-question --svg tablero.svg
+    python -m cli ask "..." --exit-status         # código 3 si la respuesta es no
+    python -m cli batch 100000 --workers 4       # simular muchas consultas
+    python -m cli replay consultas.log --index -1
+    python -m cli check                           # predictor contra el juego paso a paso
+
+Al cargar solo se importan argparse y el controlador; la simulación, el
+registro y el renderizado se importan dentro del subcomando que los usa,
+para que el arranque en frío sea corto y se pueda llamar en un bucle.
+"""
+import argparse
+import sys
+from controllers.game_controller import GameController
+from utils.constants import NUM_PILES, CARDS_PER_PILE, CENTER_PILE
+from utils.instrumentation import configure_from_env
+
+# Código de salida de una respuesta negativa con --exit-status (argparse usa 2)
+NO_EXIT_STATUS = 3
+
+
+def play_to_end(controller, question, cards=None, board=True):
+    """
+    Juega una consulta completa sin animaciones
+
+    Args:
+        controller (GameController): Controlador a usar
+        question (str): La pregunta al oráculo
+        cards (list): Baraja ya ordenada; si se omite se mezcla
+        board (bool): Si hace falta el tablero final; si no, se usa el
+            resultado ya conocido cuando lo hay (ver GameController.answer)
+
+    Returns:
+        str: "success" o "failure"
+    """
+    controller.start_game(question, cards)
+    if not board:
+        result = controller.answer()
+        if result is not None:
+            return result
+    controller.flip_card(CENTER_PILE, 0)
+    controller.auto_complete()
+    return controller.get_result()
+
+
+def describe_piles(piles):
+    """
+    Texto con el tablero, una pila por línea
+
+    Args:
+        piles (list): Lista de pilas con cartas
+
+    Returns:
+        str: Tablero con las cartas boca abajo como "??"
+    """
+    return "\n".join(
+        f"{pile_index + 1:2d}: " + " ".join(repr(card) if card.face_up else "??" for card in pile)
+        for pile_index, pile in enumerate(piles)
+    )
+
+
+def command_ask(args):
+    """Responde una pregunta"""
+    controller = GameController(args.seed, question_seeded=args.by_question, salt=args.salt)
+    writer = None
+    if args.log:
+        from storage.move_log import MoveLogWriter
+        writer = controller.recorder = MoveLogWriter(args.log)
+
+    try:
+        result = play_to_end(controller, args.question, board=bool(args.show or args.svg))
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if args.svg:
+        from ui.canvas_backend import render_board_svg
+        with open(args.svg, "w", encoding="utf-8") as svg_file:
+            svg_file.write(render_board_svg(controller.state.piles))
+
+    if args.json:
+        import json
+        print(json.dumps({'question': args.question, 'result': result}, ensure_ascii=False))
+    else:
+        if args.show:
+            print(describe_piles(controller.state.piles))
+        print("✨ Éxito ✨" if result == "success" else "Fracaso")
+    # Responder "no" no es un error; solo se refleja en el código si se pide
+    if args.exit_status and result != "success":
+        return NO_EXIT_STATUS
+    return 0
+
+
+def command_batch(args):
+    """Simula muchas consultas"""
+    from simulation.runner import run_parallel
+
+    summary = run_parallel(args.deals, args.seed, args.workers, num_piles=args.piles,
+                           cards_per_pile=args.cards_per_pile, backend=args.backend,
+                           detailed=args.detailed)
+    if args.json:
+        import json
+        print(json.dumps(summary.to_dict()))
+    else:
+        print(f"Consultas: {summary.deals}")
+        print(f"Éxitos:    {summary.successes} ({summary.success_rate:.4%})")
+        print(f"Reveladas: {summary.mean_revealed:.2f} en promedio")
+    return 0
+
+
+def command_replay(args):
+    """Reproduce consultas de un registro"""
+    from storage.move_log import MoveLogReader
+
+    mismatches = 0
+    with MoveLogReader(args.log) as reader:
+        indices = [args.index] if args.index is not None else range(len(reader))
+        controller = GameController()
+        for game_index in indices:
+            record = reader[game_index]
+            controller.reset()
+            record.replay(controller)
+            result = controller.state.result
+            if record.result is not None and result != record.result:
+                mismatches += 1
+            if args.show:
+                print(describe_piles(controller.state.piles))
+            print(f"{game_index}\t{result or 'sin terminar'}\t{record.question}")
+    return 1 if mismatches else 0
+
+
+def command_check(args):
+    """Contrasta el predictor con el motor paso a paso, el controlador y las pilas compactas"""
+    from simulation.engine import count_predictor_mismatches, play_deal, predict_deal, SUCCESS
+
+    mismatches = 0
+    # El predictor contra el motor, en la configuración pedida y en otras pequeñas
+    configurations = {(args.piles, args.cards_per_pile)}
+    configurations.update((num_piles, cards_per_pile) for num_piles in range(1, 7)
+                          for cards_per_pile in range(1, 5))
+    for num_piles, cards_per_pile in sorted(configurations):
+        found = count_predictor_mismatches(args.deals, args.seed, num_piles, cards_per_pile)
+        if found:
+            print(f"{num_piles}x{cards_per_pile}: {found} diferencias entre predict_deal y play_deal")
+        mismatches += found
+
+    # Partidas completas con el controlador, como las juega la interfaz
+    controller = GameController(args.seed)
+    for _ in range(args.games):
+        controller.reset()
+        result = play_to_end(controller, "verificación")
+        deal = [card.num_value for card in controller.deck.cards]
+        expected = predict_deal(deal)
+        # answer() juega la misma repartición sobre las pilas compactas
+        compact = controller.answer()
+        if (result == "success") != expected or play_deal(deal)[SUCCESS] != expected \
+                or compact != result:
+            mismatches += 1
+            print(f"Diferencia con el controlador: {deal}")
+
+    print(f"Reparticiones contrastadas: {args.deals} por configuración, {args.games} partidas "
+          f"con el controlador; diferencias: {mismatches}")
+    return 1 if mismatches else 0
+
+
+def build_parser():
+    """Argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Oráculo de Cartas sin pantalla")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ask = commands.add_parser("ask", help="responder una pregunta")
+    ask.add_argument("question")
+    ask.add_argument("--seed", type=int, help="semilla de la mezcla")
+    ask.add_argument("--by-question", action="store_true",
+                     help="la misma pregunta da siempre la misma repartición")
+    ask.add_argument("--salt", help="texto que se mezcla con la pregunta (por ejemplo la fecha)")
+    ask.add_argument("--show", action="store_true", help="mostrar el tablero final")
+    ask.add_argument("--svg", help="guardar el tablero final como SVG")
+    ask.add_argument("--log", help="agregar la consulta a este registro binario")
+    ask.add_argument("--json", action="store_true", help="salida en JSON")
+    ask.add_argument("--exit-status", action="store_true",
+                     help=f"salir con código {NO_EXIT_STATUS} si la respuesta es fracaso")
+    ask.set_defaults(handler=command_ask)
+
+    batch = commands.add_parser("batch", help="simular muchas consultas")
+    batch.add_argument("deals", type=int)
+    batch.add_argument("--seed", type=int, default=0, help="semilla maestra")
+    batch.add_argument("--workers", type=int, help="procesos (por defecto uno por núcleo)")
+    batch.add_argument("--piles", type=int, default=NUM_PILES)
+    batch.add_argument("--cards-per-pile", type=int, default=CARDS_PER_PILE)
+    batch.add_argument("--backend", default="random", help="generador: random o numpy")
+    batch.add_argument("--detailed", action="store_true", help="acumular distribuciones")
+    batch.add_argument("--json", action="store_true", help="salida en JSON")
+    batch.set_defaults(handler=command_batch)
+
+    replay = commands.add_parser("replay", help="reproducir un registro binario")
+    replay.add_argument("log")
+    replay.add_argument("--index", type=int, help="solo esta consulta (admite negativos)")
+    replay.add_argument("--show", action="store_true", help="mostrar cada tablero final")
+    replay.set_defaults(handler=command_replay)
+
+    check = commands.add_parser("check", help="contrastar el predictor con el juego paso a paso")
+    check.add_argument("--deals", type=int, default=20000, help="reparticiones por configuración")
+    check.add_argument("--games", type=int, default=2000, help="partidas con el controlador")
+    check.add_argument("--seed", type=int, default=0)
+    check.add_argument("--piles", type=int, default=NUM_PILES)
+    check.add_argument("--cards-per-pile", type=int, default=CARDS_PER_PILE)
+    check.set_defaults(handler=command_check)
+    return parser
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        configure_from_env()
+    except ValueError as error:
+        parser.error(str(error))
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
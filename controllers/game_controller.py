@@ -1,31 +1,101 @@
 """
 Controlador principal del juego
 """
+import random
+from models.compact import card_code, CompactDeck
 from models.deck import Deck
 from models.game_state import GameState
+from simulation.engine import predict_deal
+from utils.cache import LRUCache
+from utils.constants import CENTER_PILE, QUESTION_SEEDS
+from utils.questions import normalize_question, question_seed
 
 class GameController:
-    def __init__(self):
-        """Inicializa el controlador del juego"""
-        self.deck = Deck()
+    def __init__(self, rng=None, question_seeded=False, salt=None, cache=None, undo=False):
+        """
+        Inicializa el controlador del juego
+        
+        Args:
+            rng: Generador para mezclar, semilla entera o None para usar el
+                generador global de random
+            question_seeded (bool): Si la mezcla se deriva de la pregunta, de
+                modo que repetirla da la misma repartición
+            salt: Texto, o función que lo devuelve, que se mezcla con la
+                pregunta (por ejemplo utils.questions.daily_salt)
+            cache (LRUCache): Caché de reparticiones por pregunta; puede
+                compartirse entre controladores
+            undo (bool): Si se guarda una foto antes de cada colocación para
+                poder deshacerla (ver undo/redo)
+        """
+        self.deck = Deck(rng)
         self.state = GameState()
+        # Baraja y pilas compactas para responder sin mover las cartas (ver answer)
+        self.compact_deck = CompactDeck()
+        self.compact_piles = None
+        # Objeto opcional que recibe on_start/on_flip/on_place/on_undo/on_redo/on_result
+        self.recorder = None
+        # Fotos del estado para deshacer y rehacer colocaciones
+        self.undo_enabled = undo
+        self.undo_stack = []
+        self.redo_stack = []
+        self.question_seeded = question_seeded
+        self.salt = salt
+        if question_seeded and cache is None:
+            cache = LRUCache(QUESTION_SEEDS['cache_size'], QUESTION_SEEDS['cache_ttl'])
+        self.cache = cache
+        # Resultado ya conocido de la repartición actual (modo por pregunta)
+        self.known_result = None
     
-    def start_game(self, question):
+    def start_game(self, question, cards=None):
         """
         Inicia el juego con una pregunta
         
         Args:
             question (str): La pregunta al oráculo
+            cards (list): Baraja ya ordenada a repartir; si se omite se mezcla
         """
         self.state.set_question(question)
         self.state.state = "shuffling"
         
         # Mezclar y distribuir
-        self.deck.shuffle()
-        piles = self.deck.distribute_to_piles()
+        self.known_result = None
+        if cards is not None:
+            self.deck.cards = list(cards)
+        elif self.question_seeded:
+            self.deal_for_question(question)
+        else:
+            self.deck.shuffle()
+        piles = self.deck.distribute_to_piles(piles=self.state.piles)
         self.state.set_piles(piles)
+        self.undo_stack.clear()
+        self.redo_stack.clear()
         
         self.state.state = "playing"
+        if self.recorder is not None:
+            self.recorder.on_start(question, self.deck.cards)
+    
+    def deal_for_question(self, question):
+        """
+        Ordena la baraja según la pregunta, usando la caché si ya se repartió
+        
+        Args:
+            question (str): La pregunta al oráculo
+        """
+        salt = self.salt() if callable(self.salt) else self.salt
+        key = (normalize_question(question), salt)
+        deck = self.deck
+        deck.initialize()
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            codes, self.known_result = cached
+            # El orden inicial de la baraja es el de los códigos de carta
+            deck.cards[:] = [deck.pool[code] for code in codes]
+            return
+        
+        random.Random(question_seed(question, salt)).shuffle(deck.cards)
+        self.known_result = self.predict_result()
+        self.cache.put(key, (bytes(card_code(card) for card in deck.cards), self.known_result))
     
     def flip_card(self, pile_index, card_index):
         """
@@ -49,8 +119,10 @@ class GameController:
         if card.face_up:
             return False
         
-        card.flip()
+        self.state.flip_card(pile_index, card_index)
         self.state.select_card(card, pile_index)
+        if self.recorder is not None:
+            self.recorder.on_flip(pile_index, card_index)
         return True
     
     def place_card(self, target_pile):
@@ -66,16 +138,90 @@ class GameController:
         if not self.state.can_place_card(target_pile):
             return False
         
+        if self.undo_enabled:
+            self.undo_stack.append(self.state.snapshot())
+            self.redo_stack.clear()
+        
         from_pile = self.state.selected_pile
         card = self.state.selected_card
         
         # Remover de pila original
-        self.state.piles[from_pile].pop()
+        self.state.pop_card(from_pile)
         
         # Agregar a pila objetivo
-        self.state.piles[target_pile].append(card)
+        self.state.push_card(target_pile, card)
         
         self.state.deselect_card()
+        if self.recorder is not None:
+            self.recorder.on_place(target_pile)
+        return True
+    
+    def snapshot(self):
+        """
+        Foto del estado actual, para ramificar la partida en análisis
+
+        Returns:
+            GameSnapshot: Foto inmutable que comparte las pilas con el estado
+        """
+        return self.state.snapshot()
+    
+    def restore(self, snapshot):
+        """
+        Vuelve a una foto de la partida actual
+        
+        Args:
+            snapshot (GameSnapshot): Foto tomada con snapshot()
+        """
+        self.state.restore(snapshot)
+    
+    def can_undo(self):
+        """
+        Verifica si hay una colocación para deshacer
+        
+        Returns:
+            bool: True si se puede deshacer
+        """
+        return bool(self.undo_stack)
+    
+    def can_redo(self):
+        """
+        Verifica si hay una colocación deshecha para rehacer
+        
+        Returns:
+            bool: True si se puede rehacer
+        """
+        return bool(self.redo_stack)
+    
+    def undo(self):
+        """
+        Deshace la última colocación y la volteada que la siguió
+        
+        El estado vuelve a tener seleccionada la carta que se había colocado.
+        
+        Returns:
+            bool: True si se pudo deshacer
+        """
+        if not self.undo_stack:
+            return False
+        self.redo_stack.append(self.state.snapshot())
+        self.state.restore(self.undo_stack.pop())
+        if self.recorder is not None:
+            self.recorder.on_undo()
+        return True
+    
+    def redo(self):
+        """
+        Rehace la última colocación deshecha
+        
+        Returns:
+            bool: True si se pudo rehacer
+        """
+        if not self.redo_stack:
+            return False
+        self.undo_stack.append(self.state.snapshot())
+        self.state.restore(self.redo_stack.pop())
+        if self.recorder is not None:
+            self.recorder.on_redo()
         return True
     
     def get_next_card_to_flip(self, pile_index):
@@ -88,15 +234,36 @@ class GameController:
         Returns:
             int or None: Índice de la carta o None si no hay más
         """
-        if pile_index >= len(self.state.piles):
-            return None
+        return self.state.next_card_to_flip(pile_index)
+    
+    def auto_complete(self, max_moves=None):
+        """
+        Juega automáticamente las colocaciones pendientes en un bucle cerrado
         
-        pile = self.state.piles[pile_index]
-        for i, card in enumerate(pile):
-            if not card.face_up:
-                return i
+        Cada colocación pone la carta seleccionada en su pila y voltea la
+        siguiente carta de esa pila, igual que hace la interfaz paso a paso.
+        
+        Args:
+            max_moves (int): Máximo de colocaciones (None para terminar el juego)
+            
+        Returns:
+            list: Colocaciones hechas como (pila destino, índice volteado);
+                el índice es None en la última si el juego terminó
+        """
+        moves = []
+        while self.state.selected_card and (max_moves is None or len(moves) < max_moves):
+            target_pile = self.state.selected_card.num_value - 1
+            self.place_card(target_pile)
+            
+            if self.check_game_over(target_pile):
+                moves.append((target_pile, None))
+                break
+            
+            card_index = self.get_next_card_to_flip(target_pile)
+            self.flip_card(target_pile, card_index)
+            moves.append((target_pile, card_index))
         
-        return None
+        return moves
     
     def check_game_over(self, last_pile):
         """
@@ -108,8 +275,7 @@ class GameController:
         Returns:
             bool: True si el juego terminó
         """
-        face_down = self.state.get_face_down_cards(last_pile)
-        return len(face_down) == 0
+        return self.state.face_down_count(last_pile) == 0
     
     def get_result(self):
         """
@@ -121,9 +287,59 @@ class GameController:
         victory = self.state.check_victory()
         self.state.result = "success" if victory else "failure"
         self.state.state = "result"
+        if self.recorder is not None:
+            self.recorder.on_result(self.state.result)
         return self.state.result
-    
+
+    def answer(self):
+        """
+        Termina la consulta sin jugarla sobre el tablero
+        
+        En el modo por pregunta el resultado se guarda en la caché junto con
+        la repartición, así que repetir una pregunta no necesita jugar. Si no
+        se conoce, la repartición se juega sobre los códigos de carta en
+        CompactPiles, sin tocar las cartas. El tablero queda como se repartió.
+        Con un recorder no se usa, porque hay que jugar para grabar las
+        colocaciones.
+        
+        Returns:
+            str or None: "success" o "failure", o None si hay que jugarla
+        """
+        if self.recorder is not None:
+            return None
+        result = self.known_result
+        if result is None:
+            self.compact_deck.cards[:] = map(card_code, self.deck.cards)
+            self.compact_piles = self.compact_deck.distribute_to_piles(piles=self.compact_piles)
+            result = "success" if self.compact_piles.play(CENTER_PILE) else "failure"
+        self.state.result = result
+        self.state.state = "result"
+        return result
+
+    def predict_result(self):
+        """
+        Anticipa el resultado de la repartición actual sin jugarla
+
+        Se calcula a partir del orden de la baraja, que no cambia durante
+        la partida, así que puede consultarse en cualquier momento.
+
+        Returns:
+            str: "success" o "failure"
+        """
+        if self.known_result is not None:
+            return self.known_result
+        deal = [card.num_value for card in self.deck.cards]
+        return "success" if predict_deal(deal) else "failure"
+
     def reset(self):
-        """Reinicia el juego completamente"""
+        """
+        Reinicia el juego completamente
+
+        Reutiliza las cartas, las pilas y el estado: las cartas vuelven boca
+        abajo y la próxima partida las mezcla y reparte en su lugar.
+        """
         self.deck.initialize()
-        self.state = GameState()
\ No newline at end of file
+        self.state.clear()
+        self.known_result = None
+        self.undo_stack.clear()
+        self.redo_stack.clear()
\ No newline at end of file
@@ -5,8 +5,13 @@ Ejecuta este archivo para iniciar el juego
 import tkinter as tk
 from tkinter import messagebox
 from controllers.game_controller import GameController
+from storage.history import HistoryStore
+from ui.animation import AnimationScheduler, CardFlight, CardFlip
 from ui.pile_renderer import PileRenderer
-from utils.constants import COLORS, WINDOW_WIDTH, WINDOW_HEIGHT, ANIMATION_TIMES
+from utils.constants import (COLORS, WINDOW_WIDTH, WINDOW_HEIGHT, ANIMATION_TIMES, AUTO_PLAY,
+                             HISTORY_PATH, QUESTION_SEEDS)
+from utils.instrumentation import configure_from_env
+from utils.questions import daily_salt
 
 class OracleCardGame:
     def __init__(self, root):
@@ -21,11 +26,23 @@ class OracleCardGame:
         self.root.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
         self.root.configure(bg=COLORS['bg_main'])
         
-        # Controlador del juego
-        self.controller = GameController()
+        # Controlador del juego; cada consulta terminada queda en el historial
+        self.controller = GameController(
+            question_seeded=QUESTION_SEEDS['enabled'],
+            salt=daily_salt if QUESTION_SEEDS['daily_salt'] else None,
+            undo=True
+        )
+        # Si la base no se puede abrir, se juega sin historial (ver storage.history)
+        self.history = HistoryStore(HISTORY_PATH)
+        if self.history.enabled:
+            self.controller.recorder = self.history
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
         # Crear interfaz
         self.create_widgets()
+        
+        # Reloj único para acciones diferidas, animaciones y redibujados
+        self.scheduler = AnimationScheduler(self.root, self.update_game_display)
     
     def create_widgets(self):
         """Crea todos los widgets de la interfaz"""
@@ -103,7 +120,7 @@ class OracleCardGame:
         self.question_frame.place_forget()
         self.show_shuffling_message()
         
-        self.root.after(ANIMATION_TIMES['shuffle_wait'], lambda: self.shuffle_and_distribute(question))
+        self.scheduler.call_later(ANIMATION_TIMES['shuffle_wait'], lambda: self.shuffle_and_distribute(question))
     
     def show_shuffling_message(self):
         """Muestra mensaje de mezclado"""
@@ -126,12 +143,12 @@ class OracleCardGame:
         """
         self.controller.start_game(question)
         self.setup_game_board()
-        self.root.after(ANIMATION_TIMES['flip_delay'], lambda: self.auto_flip_first_card())
+        self.scheduler.call_later(ANIMATION_TIMES['flip_delay'], self.auto_flip_first_card)
     
     def auto_flip_first_card(self):
         """Voltea automáticamente la primera carta del centro"""
         self.controller.flip_card(12, 0)
-        self.update_game_display()
+        self.scheduler.request_render()
     
     def setup_game_board(self):
         """Configura el tablero de juego"""
@@ -213,9 +230,27 @@ class OracleCardGame:
         )
         self.auto_all_button.pack(side=tk.LEFT, padx=3)
         
+        for text, command in (("↶ Deshacer", self.undo_move), ("↷ Rehacer", self.redo_move)):
+            tk.Button(
+                controls_container,
+                text=text,
+                font=("Arial", 9, "bold"),
+                bg=COLORS['purple_dark'],
+                fg="white",
+                activebackground=COLORS['purple_active'],
+                activeforeground="white",
+                padx=12,
+                pady=6,
+                relief=tk.FLAT,
+                cursor="hand2",
+                command=command
+            ).pack(side=tk.LEFT, padx=3)
+        
         # Canvas del juego
         self.game_canvas.pack(fill=tk.BOTH, expand=True)
         
+        # Tablero nuevo: el renderizador vuelve a crear todos los elementos
+        self.pile_renderer.reset()
         self.update_game_display()
     
     def update_game_display(self):
@@ -260,24 +295,61 @@ class OracleCardGame:
         
         self.controller.state.animating = True
         
+        from_pile = self.controller.state.selected_pile
+        card = self.controller.state.selected_card
         success = self.controller.place_card(target_pile)
         if not success:
             self.controller.state.animating = False
             return
         
-        self.update_game_display()
+        self.scheduler.request_render()
         
         # Verificar si hay más cartas
         if self.controller.check_game_over(target_pile):
-            self.root.after(ANIMATION_TIMES['flip_delay'], self.show_result)
+            self.scheduler.call_later(ANIMATION_TIMES['flip_delay'], self.show_result)
         else:
             next_card_idx = self.controller.get_next_card_to_flip(target_pile)
             if next_card_idx is not None:
-                self.root.after(ANIMATION_TIMES['place_card_delay'], 
-                              lambda: self.flip_and_continue(target_pile, next_card_idx))
+                # La carta vuela a su pila cuando ya está dibujada allí
+                self.scheduler.after_render(
+                    lambda: self.launch_flight(card, from_pile, target_pile, next_card_idx))
             else:
                 self.controller.state.animating = False
     
+    def launch_flight(self, card, from_pile, target_pile, next_card_idx):
+        """
+        Hace volar la carta colocada hasta su lugar en la pila destino
+        
+        La carta ya dibujada en la pila queda oculta durante el vuelo para
+        que no se vean dos copias; al aterrizar reaparece y se voltea la
+        siguiente carta de la pila.
+        
+        Args:
+            card (Card): La carta colocada
+            from_pile (int): Pila de origen
+            target_pile (int): Pila destino
+            next_card_idx (int): Índice de la carta a voltear al aterrizar
+        """
+        landed = self.pile_renderer.card_items(target_pile, len(self.controller.state.piles[target_pile]) - 1)
+        target = None
+        if landed is not None:
+            items, x, y = landed
+            target = (x, y)
+            for item in items:
+                self.game_canvas.itemconfigure(item, state="hidden")
+        
+        def land():
+            if landed is not None:
+                for item in landed[0]:
+                    self.game_canvas.itemconfigure(item, state="normal")
+            self.flip_and_continue(target_pile, next_card_idx)
+        
+        self.scheduler.add_tween(CardFlight(
+            self.game_canvas, self.pile_renderer.card_renderer, card,
+            from_pile, target_pile, ANIMATION_TIMES['place_card_delay'],
+            on_done=land, target=target
+        ))
+    
     def flip_and_continue(self, pile_index, card_index):
         """
         Voltea carta y continúa el juego
@@ -288,7 +360,21 @@ class OracleCardGame:
         """
         self.controller.flip_card(pile_index, card_index)
         self.controller.state.animating = False
-        self.update_game_display()
+        # La posición de la carta se lee ya dibujada boca arriba
+        self.scheduler.after_render(lambda: self.start_flip(pile_index, card_index))
+    
+    def start_flip(self, pile_index, card_index):
+        """
+        Anima el volteo de una carta ya dibujada boca arriba
+        
+        Args:
+            pile_index (int): Índice de la pila
+            card_index (int): Índice de la carta
+        """
+        drawn = self.pile_renderer.card_items(pile_index, card_index)
+        if drawn is not None:
+            items, x, y = drawn
+            self.scheduler.add_tween(CardFlip(self.game_canvas, items, x, y, ANIMATION_TIMES['flip_delay']))
     
     def auto_play_step(self):
         """Juega automáticamente un paso"""
@@ -304,31 +390,50 @@ class OracleCardGame:
             return
         
         self.controller.state.animating = True
-        self.auto_play_recursive()
+        
+        if AUTO_PLAY['instant']:
+            # Resolver todo de una vez y mostrar solo el tablero final
+            self.controller.auto_complete()
+            self.scheduler.request_render()
+            self.scheduler.call_later(ANIMATION_TIMES['flip_delay'], self.show_result)
+        else:
+            self.auto_play_batch()
     
-    def auto_play_recursive(self):
-        """Juega recursivamente de forma automática"""
-        if not self.controller.state.selected_card:
+    def auto_play_batch(self):
+        """Juega un grupo de colocaciones y las muestra en un solo redibujado"""
+        moves = self.controller.auto_complete(AUTO_PLAY['moves_per_frame'])
+        self.scheduler.request_render()
+        
+        if moves and moves[-1][1] is None:
+            self.scheduler.call_later(ANIMATION_TIMES['flip_delay'], self.show_result)
+        elif self.controller.state.selected_card:
+            self.scheduler.call_later(ANIMATION_TIMES['auto_play_frame'], self.auto_play_batch)
+        else:
             self.controller.state.animating = False
+    
+    def undo_move(self):
+        """Deshace la última colocación"""
+        # El volteo sigue animándose con la partida ya desbloqueada; sus
+        # coordenadas pisarían las de la carta restaurada
+        if self.controller.state.animating or self.scheduler.busy or self.controller.state.state != "playing":
             return
         
-        target_pile = self.controller.state.selected_card.num_value - 1
-        self.controller.place_card(target_pile)
-        self.update_game_display()
+        if self.controller.undo():
+            self.scheduler.request_render()
+    
+    def redo_move(self):
+        """Rehace la última colocación deshecha"""
+        # El volteo sigue animándose con la partida ya desbloqueada; sus
+        # coordenadas pisarían las de la carta restaurada
+        if self.controller.state.animating or self.scheduler.busy or self.controller.state.state != "playing":
+            return
         
-        if self.controller.check_game_over(target_pile):
-            self.root.after(ANIMATION_TIMES['flip_delay'], self.show_result)
-        else:
-            next_card_idx = self.controller.get_next_card_to_flip(target_pile)
-            if next_card_idx is not None:
-                self.controller.flip_card(target_pile, next_card_idx)
-                self.root.after(ANIMATION_TIMES['auto_play_delay'], 
-                              lambda: (self.update_game_display(), self.auto_play_recursive()))
-            else:
-                self.controller.state.animating = False
+        if self.controller.redo():
+            self.scheduler.request_render()
     
     def show_result(self):
         """Muestra el resultado del juego"""
+        self.scheduler.stop()
         result = self.controller.get_result()
         success = result == "success"
         
@@ -416,9 +521,16 @@ class OracleCardGame:
         
         self.question_text.delete("1.0", tk.END)
         self.question_frame.place(relx=0.5, rely=0.5, anchor="center")
+    
+    def close(self):
+        """Guarda lo pendiente del historial y cierra la ventana"""
+        self.scheduler.stop()
+        self.history.close()
+        self.root.destroy()
 
 
 if __name__ == "__main__":
+    configure_from_env()
     root = tk.Tk()
     game = OracleCardGame(root)
     root.mainloop()
\ No newline at end of file
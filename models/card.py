@@ -1,8 +1,11 @@
 """
 Módulo que define la clase Card (Carta)
 """
+from utils import allocations
 
 class Card:
+    __slots__ = ('suit', 'value', 'num_value', 'face_up')
+
     def __init__(self, suit, value, num_value):
         """
         Inicializa una carta
@@ -16,11 +19,16 @@ class Card:
         self.value = value
         self.num_value = num_value
         self.face_up = False
+        allocations.record("card")
     
     def flip(self):
         """Voltea la carta boca arriba"""
         self.face_up = True
     
+    def turn_down(self):
+        """Deja la carta boca abajo, para reutilizarla en otra partida"""
+        self.face_up = False
+    
     def is_red(self):
         """
         Verifica si la carta es roja
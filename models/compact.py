@@ -0,0 +1,360 @@
+"""
+Representación compacta de la baraja y las pilas
+
+Cada carta es un entero pequeño (0..51) con el mismo orden que
+Deck.initialize: código = índice_de_palo * 13 + (valor_numérico - 1). Las
+pilas viven en un único bytearray, cada una en su propio tramo de tamaño
+fijo, y el estado boca arriba es una máscara de bits indexada por código.
+Card queda como una vista delgada para la interfaz.
+"""
+from array import array
+from models.card import Card
+from models.deck import Deck
+from utils.constants import NUM_PILES, CARDS_PER_PILE
+from utils.rng import make_rng
+
+NUM_VALUES = len(Deck.VALUES)
+SUIT_INDEX = {suit: index for index, suit in enumerate(Deck.SUITS)}
+DECK_SIZE = len(Deck.SUITS) * NUM_VALUES
+
+
+def encode(suit, num_value):
+    """
+    Codifica una carta como entero
+
+    Args:
+        suit (str): El palo de la carta
+        num_value (int): Valor numérico (1-13)
+
+    Returns:
+        int: Código de la carta (0-51)
+    """
+    return SUIT_INDEX[suit] * NUM_VALUES + num_value - 1
+
+
+def card_code(card):
+    """
+    Código entero de un objeto Card
+
+    Args:
+        card (Card): La carta
+
+    Returns:
+        int: Código de la carta (0-51)
+    """
+    return SUIT_INDEX[card.suit] * NUM_VALUES + card.num_value - 1
+
+
+def num_value_of(code):
+    """
+    Valor numérico de un código de carta
+
+    Args:
+        code (int): Código de la carta
+
+    Returns:
+        int: Valor numérico (1-13)
+    """
+    return code % NUM_VALUES + 1
+
+
+def to_card(code, face_up=False):
+    """
+    Crea la vista Card de un código
+
+    Args:
+        code (int): Código de la carta
+        face_up (bool): Si la carta está boca arriba
+
+    Returns:
+        Card: Carta equivalente al código
+    """
+    suit_index, value_index = divmod(code, NUM_VALUES)
+    card = Card(Deck.SUITS[suit_index], Deck.VALUES[value_index], value_index + 1)
+    card.face_up = face_up
+    return card
+
+
+class CompactDeck:
+    def __init__(self):
+        """Inicializa una baraja compacta en el orden de Deck.initialize"""
+        self.cards = bytearray(range(DECK_SIZE))
+
+    def initialize(self):
+        """Restaura el orden original sin reservar memoria nueva"""
+        self.cards[:] = range(DECK_SIZE)
+
+    def shuffle(self, rng=None):
+        """
+        Mezcla la baraja en el mismo buffer
+
+        random.shuffle recorre la secuencia igual que con la lista de Deck,
+        así que un generador con la misma semilla produce la misma
+        repartición que Deck.shuffle.
+
+        Args:
+            rng: Generador, semilla o None (ver utils.rng.make_rng)
+        """
+        make_rng(rng).shuffle(self.cards)
+
+    def distribute_to_piles(self, num_piles=NUM_PILES, cards_per_pile=CARDS_PER_PILE, piles=None):
+        """
+        Distribuye las cartas en pilas compactas
+
+        Args:
+            num_piles (int): Número de pilas a crear
+            cards_per_pile (int): Cartas por pila
+            piles (CompactPiles): Pilas de una partida anterior para rellenar
+                en su lugar; si se omiten (o no son tantas) se crean nuevas
+
+        Returns:
+            CompactPiles: Pilas con las cartas repartidas
+        """
+        if piles is None or len(piles) != num_piles or piles.capacity < len(self.cards):
+            piles = CompactPiles(num_piles, len(self.cards))
+        piles.deal(self.cards, cards_per_pile)
+        return piles
+
+
+class CompactPiles:
+    def __init__(self, num_piles=NUM_PILES, capacity=DECK_SIZE):
+        """
+        Inicializa pilas vacías sobre un único buffer
+
+        Cada pila ocupa un tramo de `capacity` bytes; como colocar una carta
+        saca otra, ninguna pila puede superar el total de cartas repartidas.
+
+        Args:
+            num_piles (int): Número de pilas
+            capacity (int): Cartas máximas por pila
+        """
+        self.num_piles = num_piles
+        self.capacity = capacity
+        self.buffer = bytearray(num_piles * capacity)
+        self.lengths = array('B', bytes(num_piles))
+        self.face_up = 0
+
+    def deal(self, cards, cards_per_pile=CARDS_PER_PILE):
+        """
+        Reparte una secuencia de códigos como Deck.distribute_to_piles
+
+        Args:
+            cards: Secuencia de códigos en el orden de la baraja
+            cards_per_pile (int): Cartas por pila
+        """
+        self.face_up = 0
+        capacity = self.capacity
+        for pile_index in range(self.num_piles):
+            chunk = cards[pile_index * cards_per_pile:(pile_index + 1) * cards_per_pile]
+            offset = pile_index * capacity
+            self.buffer[offset:offset + len(chunk)] = chunk
+            self.lengths[pile_index] = len(chunk)
+
+    def __len__(self):
+        """Número de pilas"""
+        return self.num_piles
+
+    def pile(self, pile_index):
+        """
+        Vista de solo lectura de una pila sin copiarla
+
+        Args:
+            pile_index (int): Índice de la pila
+
+        Returns:
+            memoryview: Códigos de la pila de abajo hacia arriba
+        """
+        offset = pile_index * self.capacity
+        return memoryview(self.buffer)[offset:offset + self.lengths[pile_index]].toreadonly()
+
+    def pile_len(self, pile_index):
+        """
+        Número de cartas de una pila
+
+        Args:
+            pile_index (int): Índice de la pila
+
+        Returns:
+            int: Cartas en la pila
+        """
+        return self.lengths[pile_index]
+
+    def card_at(self, pile_index, card_index):
+        """
+        Código de una carta de una pila
+
+        Args:
+            pile_index (int): Índice de la pila
+            card_index (int): Índice de la carta en la pila
+
+        Returns:
+            int: Código de la carta
+        """
+        return self.buffer[pile_index * self.capacity + card_index]
+
+    def push(self, pile_index, code):
+        """
+        Agrega una carta encima de una pila
+
+        Args:
+            pile_index (int): Índice de la pila
+            code (int): Código de la carta
+        """
+        length = self.lengths[pile_index]
+        self.buffer[pile_index * self.capacity + length] = code
+        self.lengths[pile_index] = length + 1
+
+    def pop(self, pile_index):
+        """
+        Saca la carta superior de una pila
+
+        Args:
+            pile_index (int): Índice de la pila
+
+        Returns:
+            int: Código de la carta sacada
+        """
+        length = self.lengths[pile_index] - 1
+        if length < 0:
+            raise IndexError("pop from empty pile")
+        self.lengths[pile_index] = length
+        return self.buffer[pile_index * self.capacity + length]
+
+    def flip(self, code):
+        """
+        Voltea una carta boca arriba
+
+        Args:
+            code (int): Código de la carta
+        """
+        self.face_up |= 1 << code
+
+    def is_face_up(self, code):
+        """
+        Verifica si una carta está boca arriba
+
+        Args:
+            code (int): Código de la carta
+
+        Returns:
+            bool: True si está boca arriba
+        """
+        return (self.face_up >> code) & 1 == 1
+
+    def first_face_down(self, pile_index):
+        """
+        Índice de la primera carta boca abajo de una pila
+
+        Args:
+            pile_index (int): Índice de la pila
+
+        Returns:
+            int or None: Índice de la carta o None si no hay
+        """
+        face_up = self.face_up
+        for card_index, code in enumerate(self.pile(pile_index)):
+            if not (face_up >> code) & 1:
+                return card_index
+        return None
+
+    def face_down_count(self):
+        """
+        Cuenta las cartas boca abajo que quedan en las pilas
+
+        Returns:
+            int: Cartas boca abajo
+        """
+        face_up = self.face_up
+        return sum(1 for pile_index in range(self.num_piles)
+                   for code in self.pile(pile_index) if not (face_up >> code) & 1)
+
+    def play(self, source):
+        """
+        Juega la repartición hasta el final con las reglas de GameController
+
+        Voltea la primera carta de la pila de origen y, mientras la pila
+        destino tenga cartas boca abajo, coloca la carta volteada (sacando la
+        última de su pila de origen) y voltea la siguiente de la pila destino.
+
+        Args:
+            source (int): Pila donde empieza la consulta
+
+        Returns:
+            bool: True si no quedó ninguna carta boca abajo
+        """
+        buffer = self.buffer
+        lengths = self.lengths
+        capacity = self.capacity
+        # Recién repartidas todas las cartas están boca abajo
+        face_down = self.face_down_count() if self.face_up else sum(lengths)
+        # Una carta boca abajo solo está en una pila: las repetidas ya se voltearon
+        code = buffer[source * capacity]
+        face_up = self.face_up | 1 << code
+        face_down -= 1
+        while True:
+            target = code % NUM_VALUES
+
+            # Colocar: se saca la última carta de la pila de origen
+            length = lengths[source] - 1
+            lengths[source] = length
+            if not (face_up >> buffer[source * capacity + length]) & 1:
+                face_down -= 1
+            offset = target * capacity
+            length = lengths[target]
+            buffer[offset + length] = code
+            lengths[target] = length + 1
+
+            # Voltear la primera carta boca abajo de la pila destino
+            for index in range(offset, offset + length):
+                code = buffer[index]
+                if not (face_up >> code) & 1:
+                    break
+            else:
+                self.face_up = face_up
+                return face_down == 0
+            face_up |= 1 << code
+            face_down -= 1
+            source = target
+
+    def to_card_piles(self):
+        """
+        Construye las pilas de Card que usa la interfaz
+
+        Una misma carta repetida en varias pilas se representa con el mismo
+        objeto, igual que en GameController.
+
+        Returns:
+            list: Lista de pilas con objetos Card
+        """
+        views = {}
+        piles = []
+        for pile_index in range(self.num_piles):
+            pile = []
+            for code in self.pile(pile_index):
+                card = views.get(code)
+                if card is None:
+                    card = views[code] = to_card(code, self.is_face_up(code))
+                pile.append(card)
+            piles.append(pile)
+        return piles
+
+    @classmethod
+    def from_card_piles(cls, piles, capacity=DECK_SIZE):
+        """
+        Construye pilas compactas a partir de pilas de Card
+
+        Args:
+            piles (list): Lista de pilas con objetos Card
+            capacity (int): Cartas máximas por pila
+
+        Returns:
+            CompactPiles: Pilas compactas equivalentes
+        """
+        compact = cls(len(piles), capacity)
+        for pile_index, pile in enumerate(piles):
+            for card in pile:
+                code = card_code(card)
+                compact.push(pile_index, code)
+                if card.face_up:
+                    compact.flip(code)
+        return compact
@@ -1,46 +1,58 @@
 """
 Módulo que maneja la baraja de cartas
 """
-import random
 from models.card import Card
+from utils import allocations
+from utils.rng import make_rng
 
 class Deck:
     SUITS = ['♠', '♥', '♦', '♣']
     VALUES = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
     
-    def __init__(self):
-        """Inicializa una baraja vacía"""
+    def __init__(self, rng=None):
+        """
+        Inicializa una baraja vacía
+        
+        Args:
+            rng: Generador para mezclar, semilla entera o None para usar el
+                generador global de random
+        """
+        self.rng = make_rng(rng)
+        # Las 52 cartas se crean una sola vez y se reutilizan en cada partida
+        self.pool = [Card(suit, value, i + 1)
+                     for suit in self.SUITS for i, value in enumerate(self.VALUES)]
         self.cards = []
         self.initialize()
     
     def initialize(self):
-        """Crea una baraja completa de 52 cartas"""
-        self.cards = []
-        for suit in self.SUITS:
-            for i, value in enumerate(self.VALUES):
-                card = Card(suit, value, i + 1)
-                self.cards.append(card)
+        """Deja la baraja completa, en orden y boca abajo, sin crear cartas"""
+        for card in self.pool:
+            card.turn_down()
+        self.cards[:] = self.pool
     
     def shuffle(self):
         """Mezcla la baraja de forma aleatoria"""
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
     
-    def distribute_to_piles(self, num_piles=13, cards_per_pile=4):
+    def distribute_to_piles(self, num_piles=13, cards_per_pile=4, piles=None):
         """
         Distribuye las cartas en pilas
         
         Args:
             num_piles (int): Número de pilas a crear
             cards_per_pile (int): Cartas por pila
+            piles (list): Pilas de una partida anterior para rellenar en su
+                lugar; si se omiten (o no son tantas) se crean nuevas
             
         Returns:
             list: Lista de pilas con cartas
         """
-        piles = [[] for _ in range(num_piles)]
+        if piles is None or len(piles) != num_piles:
+            piles = [[] for _ in range(num_piles)]
+            allocations.record("pile", num_piles)
         
-        for i, card in enumerate(self.cards):
-            pile_index = i // cards_per_pile
-            if pile_index < num_piles:
-                piles[pile_index].append(card)
+        for pile_index, pile in enumerate(piles):
+            start = pile_index * cards_per_pile
+            pile[:] = self.cards[start:start + cards_per_pile]
         
         return piles
\ No newline at end of file
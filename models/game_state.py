@@ -1,12 +1,66 @@
 """
 Módulo que maneja el estado del juego
 """
+from utils import allocations
+
+class GameSnapshot:
+    __slots__ = ('piles', 'face_up_mask', 'selected_card', 'selected_pile', 'face_down_counts',
+                 'face_down_total', 'next_face_down', 'state', 'result')
+
+    def __init__(self, piles, face_up_mask, selected_card, selected_pile, face_down_counts,
+                 face_down_total, next_face_down, state, result):
+        """
+        Inicializa una foto inmutable del estado
+
+        Las pilas son tuplas compartidas con el estado y con las demás fotos:
+        una pila que no cambió entre dos fotos es la misma tupla.
+
+        Args:
+            piles (tuple): Una tupla de cartas por pila
+            face_up_mask (int): Bit de cada carta boca arriba (ver GameState.card_bits)
+            selected_card (Card): La carta seleccionada o None
+            selected_pile (int): Pila de origen de la selección o None
+            face_down_counts (tuple): Cartas boca abajo por pila
+            face_down_total (int): Cartas boca abajo en total
+            next_face_down (tuple): Primera carta boca abajo de cada pila
+            state (str): Fase del juego
+            result (str): Resultado o None
+        """
+        self.piles = piles
+        self.face_up_mask = face_up_mask
+        self.selected_card = selected_card
+        self.selected_pile = selected_pile
+        self.face_down_counts = face_down_counts
+        self.face_down_total = face_down_total
+        self.next_face_down = next_face_down
+        self.state = state
+        self.result = result
+
 
 class GameState:
     def __init__(self):
         """Inicializa el estado del juego"""
-        self.question = ""
         self.piles = []
+        # Índices mantenidos en cada movimiento para consultas en O(1)
+        self.face_down_counts = []
+        self.next_face_down = []
+        # Copia persistente de las pilas (una tupla por pila) y bit de cada
+        # carta en la máscara de cartas boca arriba, para las fotos del estado
+        self.frozen_piles = []
+        self.card_bits = {}
+        self.bit_cards = []
+        self.face_up_mask = 0
+        self.clear()
+        allocations.record("state")
+    
+    def clear(self):
+        """
+        Vuelve al estado inicial conservando las listas de las pilas
+
+        Las pilas quedan para que la próxima partida las rellene en su lugar.
+        """
+        self.question = ""
+        self.face_down_total = 0
         self.selected_card = None
         self.selected_pile = None
         self.state = "question"  # question, shuffling, playing, result
@@ -30,7 +84,131 @@ class GameState:
             piles (list): Lista de pilas con cartas
         """
         self.piles = piles
+        # Asignación por rebanada: se reutilizan las listas de la partida anterior
+        self.face_down_counts[:] = [sum(1 for card in pile if not card.face_up) for pile in piles]
+        self.face_down_total = sum(self.face_down_counts)
+        self.next_face_down[:] = [self._scan_face_down(pile, 0) for pile in piles]
+        self.frozen_piles[:] = [tuple(pile) for pile in piles]
+        self.bit_cards[:] = [card for pile in piles for card in pile]
+        self.card_bits.clear()
+        self.face_up_mask = 0
+        for bit, card in enumerate(self.bit_cards):
+            self.card_bits[card] = 1 << bit
+            if card.face_up:
+                self.face_up_mask |= 1 << bit
+    
+    def _scan_face_down(self, pile, start):
+        """Índice de la primera carta boca abajo desde start, o len(pile)"""
+        for i in range(start, len(pile)):
+            if not pile[i].face_up:
+                return i
+        return len(pile)
+    
+    def flip_card(self, pile_index, card_index):
+        """
+        Voltea una carta de una pila y actualiza los contadores
+        
+        Args:
+            pile_index (int): Índice de la pila
+            card_index (int): Índice de la carta en la pila
+            
+        Returns:
+            Card: La carta volteada
+        """
+        pile = self.piles[pile_index]
+        card = pile[card_index]
+        if card.face_up:
+            return card
+        card.flip()
+        self.face_up_mask |= self.card_bits[card]
+        self.face_down_counts[pile_index] -= 1
+        self.face_down_total -= 1
+        if card_index == self.next_face_down[pile_index]:
+            self.next_face_down[pile_index] = self._scan_face_down(pile, card_index + 1)
+        return card
+    
+    def pop_card(self, pile_index):
+        """
+        Saca la carta superior de una pila y actualiza los contadores
+        
+        Args:
+            pile_index (int): Índice de la pila
+            
+        Returns:
+            Card: La carta sacada
+        """
+        pile = self.piles[pile_index]
+        card = pile.pop()
+        self.frozen_piles[pile_index] = self.frozen_piles[pile_index][:-1]
+        if not card.face_up:
+            self.face_down_counts[pile_index] -= 1
+            self.face_down_total -= 1
+        if self.next_face_down[pile_index] > len(pile):
+            self.next_face_down[pile_index] = len(pile)
+        return card
+    
+    def push_card(self, pile_index, card):
+        """
+        Agrega una carta encima de una pila y actualiza los contadores
+        
+        Args:
+            pile_index (int): Índice de la pila
+            card (Card): La carta a agregar
+        """
+        pile = self.piles[pile_index]
+        pile.append(card)
+        self.frozen_piles[pile_index] += (card,)
+        if not card.face_up:
+            self.face_down_counts[pile_index] += 1
+            self.face_down_total += 1
+        elif self.next_face_down[pile_index] == len(pile) - 1:
+            self.next_face_down[pile_index] = len(pile)
     
+    def snapshot(self):
+        """
+        Toma una foto del estado sin copiar cartas
+
+        Comparte las tuplas de las pilas, así que el costo no depende de
+        cuántas cartas haya; miles de fotos de una partida ocupan poco más
+        que las pilas que cambiaron entre ellas.
+
+        Returns:
+            GameSnapshot: Foto inmutable del estado
+        """
+        return GameSnapshot(tuple(self.frozen_piles), self.face_up_mask, self.selected_card,
+                            self.selected_pile, tuple(self.face_down_counts), self.face_down_total,
+                            tuple(self.next_face_down), self.state, self.result)
+
+    def restore(self, snapshot):
+        """
+        Vuelve al estado de una foto de la partida actual
+
+        Solo se reescriben las pilas que cambiaron y solo se voltean las
+        cartas cuyo bit difiere, así que el costo es el de la distancia entre
+        el estado actual y la foto. Las listas de las pilas se conservan.
+
+        Args:
+            snapshot (GameSnapshot): Foto tomada con snapshot() en esta partida
+        """
+        frozen = self.frozen_piles
+        for pile_index, pile in enumerate(snapshot.piles):
+            if frozen[pile_index] is not pile:
+                self.piles[pile_index][:] = pile
+                frozen[pile_index] = pile
+        changed = self.face_up_mask ^ snapshot.face_up_mask
+        while changed:
+            bit = changed & -changed
+            self.bit_cards[bit.bit_length() - 1].face_up = bool(snapshot.face_up_mask & bit)
+            changed ^= bit
+        self.face_up_mask = snapshot.face_up_mask
+        self.face_down_counts[:] = snapshot.face_down_counts
+        self.face_down_total = snapshot.face_down_total
+        self.next_face_down[:] = snapshot.next_face_down
+        self.selected_card = snapshot.selected_card
+        self.selected_pile = snapshot.selected_pile
+        self.state = snapshot.state
+        self.result = snapshot.result
+
     def select_card(self, card, pile_index):
         """
         Selecciona una carta
@@ -75,6 +253,35 @@ class GameState:
             return []
         return [card for card in self.piles[pile_index] if not card.face_up]
     
+    def face_down_count(self, pile_index):
+        """
+        Número de cartas boca abajo de una pila, sin recorrerla
+        
+        Args:
+            pile_index (int): Índice de la pila
+            
+        Returns:
+            int: Cartas boca abajo
+        """
+        if pile_index >= len(self.piles):
+            return 0
+        return self.face_down_counts[pile_index]
+    
+    def next_card_to_flip(self, pile_index):
+        """
+        Índice de la primera carta boca abajo de una pila, sin recorrerla
+        
+        Args:
+            pile_index (int): Índice de la pila
+            
+        Returns:
+            int or None: Índice de la carta o None si no hay más
+        """
+        if pile_index >= len(self.piles):
+            return None
+        index = self.next_face_down[pile_index]
+        return index if index < len(self.piles[pile_index]) else None
+    
     def check_victory(self):
         """
         Verifica si todas las cartas están boca arriba
@@ -82,8 +289,4 @@ class GameState:
         Returns:
             bool: True si todas están boca arriba
         """
-        for pile in self.piles:
-            for card in pile:
-                if not card.face_up:
-                    return False
-        return True
\ No newline at end of file
+        return self.face_down_total == 0
\ No newline at end of file
@@ -0,0 +1,398 @@
+"""
+Servicio HTTP local del oráculo, sin tkinter
+
+Cada sesión envuelve su propio GameController. El servidor usa solo asyncio
+de la biblioteca estándar, con conexiones persistentes (HTTP/1.1), así que
+un único proceso atiende miles de sesiones concurrentes. Las sesiones sin
+actividad durante más de `idle_timeout` segundos se descartan.
+
+Rutas (cuerpos y respuestas en JSON):
+    POST   /sessions                    {"question": str, "seed": int?}
+    GET    /sessions/<id>               estado del tablero
+    POST   /sessions/<id>/flip          {"card": int?} voltea la siguiente carta de la pila que toca
+    POST   /sessions/<id>/place         {"pile": int}
+    POST   /sessions/<id>/auto          completa la consulta
+    GET    /sessions/<id>/result        resultado (409 si no terminó)
+    DELETE /sessions/<id>
+
+Uso:
+    python -m server.oracle_service --port 8765
+"""
+import argparse
+import asyncio
+import json
+import secrets
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from controllers.game_controller import GameController
+from utils.constants import CENTER_PILE
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_IDLE_TIMEOUT = 300
+MAX_HEADER_BYTES = 8192
+MAX_BODY_BYTES = 65536
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        """
+        Error que se responde al cliente con su código HTTP
+
+        Args:
+            status (HTTPStatus): Código de respuesta
+            message (str): Descripción del error
+        """
+        super().__init__(message)
+        self.status = status
+
+
+def serialize_state(session):
+    """
+    Describe el tablero sin revelar las cartas boca abajo
+
+    Args:
+        session (Session): La sesión
+
+    Returns:
+        dict: Estado serializable de la consulta
+    """
+    state = session.controller.state
+    return {
+        'question': state.question,
+        'state': state.state,
+        'piles': [[repr(card) if card.face_up else None for card in pile] for pile in state.piles],
+        'selected': repr(state.selected_card) if state.selected_card else None,
+        'target_pile': state.selected_card.num_value - 1 if state.selected_card else None,
+        'flip_pile': None if state.selected_card or session.finished else session.flip_pile,
+        'game_over': session.finished,
+        'result': state.result,
+    }
+
+
+class Session:
+    def __init__(self, question, seed=None):
+        """
+        Inicializa una sesión con su propio controlador
+
+        Args:
+            question (str): La pregunta al oráculo
+            seed (int): Semilla opcional para reproducir la repartición
+        """
+        self.controller = GameController(seed)
+        self.controller.start_game(question)
+        # Pila de la que toca voltear: primero el centro, luego la última destino
+        self.flip_pile = CENTER_PILE
+        self.finished = False
+        self.last_used = time.monotonic()
+
+    def flip(self, card_index=None):
+        """
+        Voltea la siguiente carta de la pila que corresponde
+
+        El índice, si se envía, solo confirma la carta que toca: el juego
+        siempre voltea la primera carta boca abajo de la pila.
+
+        Args:
+            card_index (int): Índice esperado (por defecto el siguiente)
+        """
+        controller = self.controller
+        if self.finished or controller.state.selected_card:
+            raise HTTPError(HTTPStatus.CONFLICT, "Ahora no toca voltear")
+        next_index = controller.get_next_card_to_flip(self.flip_pile)
+        if next_index is None:
+            raise HTTPError(HTTPStatus.CONFLICT, "No quedan cartas por voltear en esa pila")
+        if card_index is not None and card_index != next_index:
+            raise HTTPError(HTTPStatus.CONFLICT, f"Solo se puede voltear la carta {next_index}")
+        if not controller.flip_card(self.flip_pile, next_index):
+            raise HTTPError(HTTPStatus.CONFLICT, "No se puede voltear esa carta")
+
+    def place(self, target_pile):
+        """
+        Coloca la carta seleccionada
+
+        Args:
+            target_pile (int): Índice de la pila objetivo
+        """
+        if not self.controller.place_card(target_pile):
+            raise HTTPError(HTTPStatus.CONFLICT, "No se puede colocar en esa pila")
+        self.flip_pile = target_pile
+        self.finished = self.controller.check_game_over(target_pile)
+
+    def auto_complete(self):
+        """Termina la consulta desde donde esté"""
+        if self.finished:
+            return
+        if not self.controller.state.selected_card:
+            self.flip()
+        moves = self.controller.auto_complete()
+        self.flip_pile = moves[-1][0]
+        self.finished = True
+
+
+class OracleService:
+    def __init__(self, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        """
+        Inicializa el servicio
+
+        Args:
+            idle_timeout (float): Segundos sin uso antes de descartar una sesión
+        """
+        self.idle_timeout = idle_timeout
+        # Ordenadas de la menos a la más recientemente usada
+        self.sessions = OrderedDict()
+        self.server = None
+        self.sweeper = None
+
+    # Sesiones
+
+    def create_session(self, question, seed=None):
+        """
+        Crea una sesión nueva
+
+        Args:
+            question (str): La pregunta al oráculo
+            seed (int): Semilla opcional
+
+        Returns:
+            tuple: (id de la sesión, Session)
+        """
+        session_id = secrets.token_urlsafe(12)
+        session = self.sessions[session_id] = Session(question, seed)
+        return session_id, session
+
+    def get_session(self, session_id):
+        """
+        Busca una sesión y la marca como recién usada
+
+        Args:
+            session_id (str): Id de la sesión
+
+        Returns:
+            Session: La sesión encontrada
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "Sesión inexistente o expirada")
+        session.last_used = time.monotonic()
+        self.sessions.move_to_end(session_id)
+        return session
+
+    def evict_idle(self, now=None):
+        """
+        Descarta las sesiones inactivas
+
+        Como las sesiones están ordenadas por último uso, basta con mirar
+        desde el principio hasta encontrar una activa.
+
+        Args:
+            now (float): Instante de referencia (time.monotonic())
+
+        Returns:
+            int: Sesiones descartadas
+        """
+        now = time.monotonic() if now is None else now
+        evicted = 0
+        while self.sessions:
+            session_id, session = next(iter(self.sessions.items()))
+            if now - session.last_used < self.idle_timeout:
+                break
+            del self.sessions[session_id]
+            evicted += 1
+        return evicted
+
+    async def sweep_forever(self):
+        """Descarta sesiones inactivas periódicamente"""
+        interval = max(self.idle_timeout / 4, 0.05)
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle()
+
+    # Rutas
+
+    def dispatch(self, method, path, body):
+        """
+        Ejecuta una petición ya interpretada
+
+        Args:
+            method (str): Método HTTP
+            path (str): Ruta sin parámetros de consulta
+            body (dict): Cuerpo JSON
+
+        Returns:
+            tuple: (HTTPStatus, dict de respuesta)
+        """
+        parts = [part for part in path.split("/") if part]
+        if not parts or parts[0] != "sessions":
+            raise HTTPError(HTTPStatus.NOT_FOUND, "Ruta desconocida")
+
+        if len(parts) == 1:
+            if method != "POST":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST")
+            question = str(body.get("question", "")).strip()
+            if not question:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Falta la pregunta")
+            session_id, session = self.create_session(question, body.get("seed"))
+            return HTTPStatus.CREATED, {'session': session_id, **serialize_state(session)}
+
+        session_id = parts[1]
+        action = parts[2] if len(parts) > 2 else None
+
+        if action is None and method == "DELETE":
+            if self.sessions.pop(session_id, None) is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, "Sesión inexistente o expirada")
+            return HTTPStatus.OK, {'deleted': session_id}
+
+        session = self.get_session(session_id)
+
+        if action is None and method == "GET":
+            return HTTPStatus.OK, serialize_state(session)
+
+        if action == "result" and method == "GET":
+            if not session.finished:
+                raise HTTPError(HTTPStatus.CONFLICT, "La consulta no ha terminado")
+            return HTTPStatus.OK, {'result': session.controller.get_result()}
+
+        if method != "POST":
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Método no permitido")
+
+        if action == "flip":
+            card_index = body.get("card")
+            session.flip(None if card_index is None else int(card_index))
+        elif action == "place":
+            session.place(int(body.get("pile", -1)))
+        elif action == "auto":
+            session.auto_complete()
+        else:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "Acción desconocida")
+
+        return HTTPStatus.OK, serialize_state(session)
+
+    # Protocolo HTTP
+
+    async def handle_connection(self, reader, writer):
+        """
+        Atiende una conexión, con varias peticiones si es persistente
+
+        Args:
+            reader (asyncio.StreamReader): Flujo de entrada
+            writer (asyncio.StreamWriter): Flujo de salida
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                keep_alive = await self.handle_request(head, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def handle_request(self, head, reader, writer):
+        """
+        Interpreta una petición y escribe su respuesta
+
+        Args:
+            head (bytes): Línea de petición y cabeceras
+            reader (asyncio.StreamReader): Flujo para leer el cuerpo
+            writer (asyncio.StreamWriter): Flujo de salida
+
+        Returns:
+            bool: True si la conexión sigue abierta
+        """
+        keep_alive = False
+        try:
+            if len(head) > MAX_HEADER_BYTES:
+                raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Cabeceras demasiado grandes")
+            lines = head.decode("latin-1").split("\r\n")
+            method, target, version = lines[0].split(" ", 2)
+            headers = {}
+            for line in lines[1:]:
+                if line:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY_BYTES:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Cuerpo demasiado grande")
+            raw_body = await reader.readexactly(length) if length else b""
+            try:
+                body = json.loads(raw_body) if raw_body else {}
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "JSON inválido")
+            if not isinstance(body, dict):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Se esperaba un objeto JSON")
+
+            status, payload = self.dispatch(method, target.split("?", 1)[0], body)
+        except HTTPError as error:
+            status, payload = error.status, {'error': str(error)}
+        except (ValueError, TypeError) as error:
+            status, payload = HTTPStatus.BAD_REQUEST, {'error': str(error)}
+
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+        )
+        return keep_alive
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Empieza a escuchar conexiones
+
+        Args:
+            host (str): Dirección local
+            port (int): Puerto (0 para elegir uno libre)
+
+        Returns:
+            asyncio.Server: El servidor en marcha
+        """
+        self.server = await asyncio.start_server(self.handle_connection, host, port,
+                                                 limit=MAX_HEADER_BYTES * 2)
+        self.sweeper = asyncio.create_task(self.sweep_forever())
+        return self.server
+
+    async def stop(self):
+        """Deja de escuchar y detiene el barrido de sesiones"""
+        if self.sweeper is not None:
+            self.sweeper.cancel()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """Arranca el servicio y atiende hasta que se interrumpa"""
+    service = OracleService(idle_timeout)
+    server = await service.start(host, port)
+    print(f"Oráculo escuchando en http://{host}:{server.sockets[0].getsockname()[1]}")
+    try:
+        await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Servicio HTTP local del Oráculo de Cartas")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help="segundos sin uso antes de descartar una sesión")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.idle_timeout))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
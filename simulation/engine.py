@@ -0,0 +1,344 @@
+"""
+Motor de simulación sin interfaz del Oráculo de Cartas
+
+Reproduce las reglas de GameController (mezclar, distribuir en pilas y el
+ciclo voltear/colocar) sobre enteros, sin objetos Card ni tkinter, para
+poder jugar millones de consultas en un bucle cerrado.
+
+Una baraja se representa por su orden mezclado: cada carta es un código
+0..N-1 en el mismo orden que Deck.initialize (palo mayor, valor menor), de
+modo que una mezcla con el mismo generador produce la misma repartición
+que Deck.shuffle.
+"""
+from simulation.stats import OutcomeStats
+from utils.constants import NUM_PILES, CARDS_PER_PILE
+from utils.rng import make_rng
+
+# Índices de los campos de la tupla devuelta por play_deal
+SUCCESS = 0
+REVEALED = 1
+MOVES = 2
+END_PILE = 3
+KINGS = 4
+
+# Reparticiones generadas por lote con generadores que lo soportan
+BATCH_SIZE = 4096
+
+
+def card_ranks(num_piles=NUM_PILES, cards_per_pile=CARDS_PER_PILE):
+    """
+    Valor numérico de cada código de carta de la baraja
+
+    Con la configuración estándar (13 pilas de 4) coincide con la baraja de
+    Deck: el código c corresponde al valor c % 13 + 1.
+
+    Args:
+        num_piles (int): Número de pilas (y de valores distintos)
+        cards_per_pile (int): Cartas por pila (y copias de cada valor)
+
+    Returns:
+        list: Valor numérico (1..num_piles) indexado por código de carta
+    """
+    return [code % num_piles + 1 for code in range(num_piles * cards_per_pile)]
+
+
+def play_deal(deal, num_piles=NUM_PILES, cards_per_pile=CARDS_PER_PILE):
+    """
+    Juega una repartición completa hasta que termina
+
+    Sigue exactamente los pasos de la interfaz: voltear la primera carta del
+    centro y, mientras la pila destino tenga cartas boca abajo, colocar la
+    carta seleccionada (sacando la última de su pila de origen) y voltear la
+    siguiente de la pila destino.
+
+    Args:
+        deal (list): Valor numérico de cada carta en el orden repartido
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+
+    Returns:
+        tuple: (éxito, cartas reveladas, cartas colocadas, pila final,
+            número de carta revelada en que salió cada rey, en orden)
+    """
+    # Cada pila guarda posiciones dentro de la repartición; las cartas boca
+    # abajo de una pila son siempre el tramo piles[p][next_down[p]:] de las
+    # cartas originales, porque las colocadas llegan boca arriba al final.
+    piles = [list(range(start, start + cards_per_pile))
+             for start in range(0, num_piles * cards_per_pile, cards_per_pile)]
+    next_down = [0] * num_piles
+    face_up = bytearray(num_piles * cards_per_pile)
+    face_down = num_piles * cards_per_pile
+
+    source = num_piles - 1
+    position = piles[source][0]
+    face_up[position] = 1
+    next_down[source] = 1
+    face_down -= 1
+    revealed = 1
+    moves = 0
+    kings = [1] if deal[position] == num_piles else []
+
+    while True:
+        target = deal[position] - 1
+
+        # Colocar: se saca la última carta de la pila de origen
+        pile = piles[source]
+        if not face_up[pile.pop()]:
+            face_down -= 1
+        if next_down[source] > len(pile):
+            next_down[source] = len(pile)
+        pile = piles[target]
+        pile.append(position)
+        moves += 1
+
+        # Voltear la siguiente carta boca abajo de la pila destino
+        index = next_down[target]
+        if index >= len(pile) or face_up[pile[index]]:
+            return (face_down == 0, revealed, moves, target, kings)
+        position = pile[index]
+        face_up[position] = 1
+        next_down[target] = index + 1
+        face_down -= 1
+        revealed += 1
+        if deal[position] == num_piles:
+            kings.append(revealed)
+        source = target
+
+
+def predict_deal(deal, num_piles=NUM_PILES, cards_per_pile=CARDS_PER_PILE):
+    """
+    Decide el resultado de una repartición sin jugarla
+
+    Al colocar la primera carta se saca la última del centro, que se pierde
+    boca abajo; desde ahí cada colocación saca la carta recién colocada, así
+    que el juego es un reloj clásico con esa carta fuera. Hay éxito si la
+    carta perdida es del valor del centro (o no hay carta perdida) y si las
+    últimas cartas de las demás pilas, vistas como aristas pila -> pila de su
+    valor, forman un árbol que desemboca en el centro.
+
+    Args:
+        deal (list): Valor numérico de cada carta en el orden repartido
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+
+    Returns:
+        bool: True si la consulta termina con éxito
+    """
+    center = num_piles - 1
+    last = cards_per_pile - 1
+    if last and deal[center * cards_per_pile + last] != num_piles:
+        return False
+
+    # 0 = sin visitar, 1 = en el camino actual, 2 = llega al centro
+    reaches = bytearray(num_piles)
+    reaches[center] = 2
+    for start in range(center):
+        pile = start
+        while reaches[pile] == 0:
+            reaches[pile] = 1
+            pile = deal[pile * cards_per_pile + last] - 1
+        if reaches[pile] == 1:
+            return False
+        pile = start
+        while reaches[pile] == 1:
+            reaches[pile] = 2
+            pile = deal[pile * cards_per_pile + last] - 1
+    return True
+
+
+def count_predictor_mismatches(num_deals, rng=None, num_piles=NUM_PILES, cards_per_pile=CARDS_PER_PILE):
+    """
+    Contrasta predict_deal con play_deal sobre reparticiones mezcladas
+
+    Args:
+        num_deals (int): Número de reparticiones
+        rng: Generador, semilla o None (ver utils.rng.make_rng)
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+
+    Returns:
+        int: Reparticiones en que el predictor y el juego no coinciden
+    """
+    mismatches = 0
+    for deal in iter_deals(num_deals, rng, num_piles, cards_per_pile):
+        if predict_deal(deal, num_piles, cards_per_pile) != play_deal(deal, num_piles, cards_per_pile)[SUCCESS]:
+            mismatches += 1
+    return mismatches
+
+
+def count_successes(num_deals, rng=None, num_piles=NUM_PILES, cards_per_pile=CARDS_PER_PILE):
+    """
+    Cuenta las consultas exitosas usando solo el predictor
+
+    Args:
+        num_deals (int): Número de consultas
+        rng: Generador, semilla o None (ver utils.rng.make_rng)
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+
+    Returns:
+        int: Número de consultas exitosas
+    """
+    successes = 0
+    for deal in iter_deals(num_deals, rng, num_piles, cards_per_pile):
+        successes += predict_deal(deal, num_piles, cards_per_pile)
+    return successes
+
+
+def iter_deals(num_deals, rng=None, num_piles=NUM_PILES, cards_per_pile=CARDS_PER_PILE):
+    """
+    Genera reparticiones mezcladas como lo hace Deck.shuffle
+
+    Se mezcla directamente la lista de valores, que produce la misma
+    secuencia que mezclar las cartas y leer su valor. La lista se reutiliza
+    entre iteraciones: hay que copiarla si se quiere conservar. Si el
+    generador sabe producir permutaciones por lotes se usan esas.
+
+    Args:
+        num_deals (int): Número de reparticiones
+        rng: Generador, semilla o None (ver utils.rng.make_rng)
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+
+    Yields:
+        list: Valor numérico de cada carta en el orden repartido
+    """
+    rng = make_rng(rng)
+    if hasattr(rng, "permutations"):
+        yield from _iter_batched_deals(num_deals, rng, num_piles, cards_per_pile)
+        return
+
+    shuffle = rng.shuffle
+    deal = card_ranks(num_piles, cards_per_pile)
+    for _ in range(num_deals):
+        shuffle(deal)
+        yield deal
+
+
+def _iter_batched_deals(num_deals, rng, num_piles, cards_per_pile, batch_size=BATCH_SIZE):
+    """Genera reparticiones a partir de permutaciones calculadas por lotes"""
+    size = num_piles * cards_per_pile
+    while num_deals > 0:
+        count = min(batch_size, num_deals)
+        codes = rng.permutations(count, size)
+        yield from (codes % num_piles + 1).tolist()
+        num_deals -= count
+
+
+class SimulationSummary:
+    def __init__(self, num_piles=NUM_PILES, cards_per_pile=CARDS_PER_PILE, detailed=False):
+        """
+        Inicializa el resumen de una simulación
+
+        Args:
+            num_piles (int): Número de pilas
+            cards_per_pile (int): Cartas por pila
+            detailed (bool): Si además se acumulan distribuciones (ver
+                simulation.stats.OutcomeStats)
+        """
+        self.num_piles = num_piles
+        self.cards_per_pile = cards_per_pile
+        self.deals = 0
+        self.successes = 0
+        self.total_revealed = 0
+        self.total_moves = 0
+        self.end_piles = [0] * num_piles
+        self.stats = OutcomeStats(num_piles, cards_per_pile) if detailed else None
+
+    def add(self, outcome):
+        """
+        Acumula el resultado de una repartición
+
+        Args:
+            outcome (tuple): Tupla devuelta por play_deal
+        """
+        self.deals += 1
+        self.successes += outcome[SUCCESS]
+        self.total_revealed += outcome[REVEALED]
+        self.total_moves += outcome[MOVES]
+        self.end_piles[outcome[END_PILE]] += 1
+        if self.stats is not None:
+            self.stats.add(outcome)
+
+    def merge(self, other):
+        """
+        Suma los contadores de otro resumen de la misma configuración
+
+        Args:
+            other (SimulationSummary): Resumen a incorporar
+
+        Returns:
+            SimulationSummary: Este mismo resumen, para encadenar
+        """
+        if (other.num_piles, other.cards_per_pile) != (self.num_piles, self.cards_per_pile):
+            raise ValueError("No se pueden combinar simulaciones de configuraciones distintas")
+        self.deals += other.deals
+        self.successes += other.successes
+        self.total_revealed += other.total_revealed
+        self.total_moves += other.total_moves
+        for pile_index, count in enumerate(other.end_piles):
+            self.end_piles[pile_index] += count
+        if self.stats is not None and other.stats is not None:
+            self.stats.merge(other.stats)
+        return self
+
+    @property
+    def failures(self):
+        """int: Número de consultas fallidas"""
+        return self.deals - self.successes
+
+    @property
+    def success_rate(self):
+        """float: Proporción de consultas exitosas"""
+        return self.successes / self.deals if self.deals else 0.0
+
+    @property
+    def mean_revealed(self):
+        """float: Promedio de cartas reveladas por consulta"""
+        return self.total_revealed / self.deals if self.deals else 0.0
+
+    def to_dict(self):
+        """
+        Convierte el resumen en un diccionario serializable
+
+        Returns:
+            dict: Contadores y métricas derivadas
+        """
+        return {
+            'num_piles': self.num_piles,
+            'cards_per_pile': self.cards_per_pile,
+            'deals': self.deals,
+            'successes': self.successes,
+            'failures': self.failures,
+            'success_rate': self.success_rate,
+            'mean_revealed': self.mean_revealed,
+            'total_moves': self.total_moves,
+            'end_piles': list(self.end_piles),
+            'stats': self.stats.to_dict() if self.stats is not None else None,
+        }
+
+
+def run_simulation(num_deals, rng=None, num_piles=NUM_PILES, cards_per_pile=CARDS_PER_PILE,
+                   on_deal=None, detailed=False):
+    """
+    Juega muchas consultas seguidas y acumula sus resultados
+
+    Args:
+        num_deals (int): Número de consultas a jugar
+        rng: Generador, semilla o None (ver utils.rng.make_rng)
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+        on_deal: Función opcional llamada con (repartición, resultado)
+        detailed (bool): Acumular también las distribuciones de resultados
+
+    Returns:
+        SimulationSummary: Resumen de la simulación
+    """
+    summary = SimulationSummary(num_piles, cards_per_pile, detailed)
+    add = summary.add
+    for deal in iter_deals(num_deals, rng, num_piles, cards_per_pile):
+        outcome = play_deal(deal, num_piles, cards_per_pile)
+        add(outcome)
+        if on_deal is not None:
+            on_deal(deal, outcome)
+    return summary
@@ -0,0 +1,378 @@
+"""
+Conteo exacto de reparticiones ganadoras por enumeración exhaustiva
+
+Sirve para contrastar el simulador y las fórmulas de simulation.probability
+en configuraciones reducidas (por ejemplo 4 pilas x 2 cartas o 5 x 3) sin
+recorrer las (n*k)! permutaciones de la baraja:
+
+- Simetría de palos: el juego solo mira el valor de cada carta, así que se
+  cuentan reparticiones distintas por valor; cada una equivale a (k!)^n
+  ordenamientos de las cartas con palo.
+- Estados parciales: las cartas boca abajo son intercambiables, así que no
+  se fija la repartición de antemano sino que se juega volteando cartas y
+  eligiendo el valor de cada una entre los que quedan. El estado es cuántas
+  cartas boca abajo tiene cada pila, cuántas quedan sin revelar de cada
+  valor y qué pila se voltea ahora; al terminar, las cartas no reveladas
+  pueden estar en cualquier orden y se cuentan con un multinomial. Los
+  estados se memorizan.
+- Simetría de valores: cambiar de nombre dos valores que no son el del
+  centro, cambiando a la vez sus pilas, da un juego idéntico. La clave de
+  memoria ordena esas pilas, así que los estados equivalentes se calculan
+  una sola vez.
+
+El conteo se divide en ramas por las dos primeras cartas reveladas; tras
+cada rama se avisa el progreso y, si se pidió, se guarda un punto de
+control en JSON para retomar el conteo donde quedó.
+
+Uso:
+    python -m simulation.exhaustive 5 3 --checkpoint conteo_5x3.json
+    python -m simulation.exhaustive 4 2 --check
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from fractions import Fraction
+from math import factorial
+from simulation.engine import play_deal, SUCCESS
+from simulation.probability import MAX_ENUMERATED_DEALS, count_distinct_deals, success_probability
+from utils.constants import NUM_PILES, CARDS_PER_PILE
+
+CHECKPOINT_VERSION = 1
+
+
+class ExhaustiveCounter:
+    def __init__(self, num_piles=NUM_PILES, cards_per_pile=CARDS_PER_PILE):
+        """
+        Inicializa el contador de una configuración
+
+        Args:
+            num_piles (int): Número de pilas (y de valores distintos)
+            cards_per_pile (int): Cartas por pila (y copias de cada valor)
+        """
+        if num_piles < 1 or cards_per_pile < 1:
+            raise ValueError("Se necesita al menos una pila con al menos una carta")
+        self.num_piles = num_piles
+        self.cards_per_pile = cards_per_pile
+        self.center = num_piles - 1
+        self.factorials = [factorial(i) for i in range(num_piles * cards_per_pile + 1)]
+        # Clave canónica del estado -> reparticiones ganadoras desde él
+        self.memo = {}
+        # Estados calculados (sin contar los que salieron de la memoria)
+        self.visited = 0
+        # Ramas terminadas: (primer valor, segundo valor o None) -> ganadoras
+        self.branches = {}
+
+    def completions(self, remaining):
+        """Formas de ordenar las cartas aún no reveladas"""
+        count = self.factorials[sum(remaining)]
+        for copies in remaining:
+            count //= self.factorials[copies]
+        return count
+
+    def state_key(self, pile, face_down, remaining):
+        """
+        Clave del estado, igual para estados que solo difieren en el nombre
+        de valores (y pilas) que no son el del centro ni el de la pila actual
+        """
+        center = self.center
+        others = sorted((face_down[index], remaining[index])
+                        for index in range(center) if index != pile)
+        current = None if pile == center else (face_down[pile], remaining[pile])
+        return (current, face_down[center], remaining[center], tuple(others))
+
+    def reveal(self, pile, face_down, remaining):
+        """
+        Reparticiones ganadoras a partir de voltear la siguiente carta de una pila
+
+        Args:
+            pile (int): Pila cuya primera carta boca abajo se voltea
+            face_down (tuple): Cartas boca abajo por pila
+            remaining (tuple): Cartas sin revelar por valor (índice = valor - 1)
+
+        Returns:
+            int: Reparticiones por valor que terminan con éxito
+        """
+        key = self.state_key(pile, face_down, remaining)
+        wins = self.memo.get(key)
+        if wins is not None:
+            return wins
+        self.visited += 1
+
+        face_down = list(face_down)
+        face_down[pile] -= 1
+        face_down = tuple(face_down)
+        wins = 0
+        for value in range(self.num_piles):
+            if remaining[value]:
+                wins += self.place(value, face_down, remaining[:value] + (remaining[value] - 1,)
+                                   + remaining[value + 1:])
+        self.memo[key] = wins
+        return wins
+
+    def place(self, target, face_down, remaining):
+        """
+        Reparticiones ganadoras tras colocar la carta revelada en su pila
+
+        Args:
+            target (int): Pila destino (valor de la carta - 1)
+            face_down (tuple): Cartas boca abajo por pila, ya colocada la carta
+            remaining (tuple): Cartas sin revelar por valor
+
+        Returns:
+            int: Reparticiones por valor que terminan con éxito
+        """
+        if face_down[target]:
+            return self.reveal(target, face_down, remaining)
+        # Fin del juego: las cartas no reveladas pueden estar en cualquier orden
+        return 0 if any(face_down) else self.completions(remaining)
+
+    def first_move(self, value):
+        """
+        Estado tras voltear la primera carta del centro y colocarla
+
+        Al colocarla se saca la última carta del centro, que se pierde boca
+        abajo (salvo con una carta por pila, en que se saca la propia carta).
+
+        Args:
+            value (int): Índice del valor de la primera carta (valor - 1)
+
+        Returns:
+            tuple: (cartas boca abajo por pila, cartas sin revelar por valor)
+        """
+        k = self.cards_per_pile
+        face_down = [k] * self.num_piles
+        face_down[self.center] -= 2 if k > 1 else 1
+        remaining = [k] * self.num_piles
+        remaining[value] -= 1
+        return tuple(face_down), tuple(remaining)
+
+    def iter_branches(self):
+        """
+        Ramas del conteo en orden fijo
+
+        Returns:
+            list: Claves (primer valor, segundo valor o None si el juego
+                termina con la primera colocación)
+        """
+        branches = []
+        for first in range(self.num_piles):
+            face_down, remaining = self.first_move(first)
+            if not face_down[first]:
+                branches.append((first, None))
+            else:
+                branches.extend((first, second) for second in range(self.num_piles)
+                                if remaining[second])
+        return branches
+
+    def count_branch(self, branch):
+        """
+        Reparticiones ganadoras de una rama
+
+        Args:
+            branch (tuple): (primer valor, segundo valor o None)
+
+        Returns:
+            int: Reparticiones por valor que terminan con éxito
+        """
+        first, second = branch
+        face_down, remaining = self.first_move(first)
+        if second is None:
+            return self.place(first, face_down, remaining)
+        face_down = face_down[:first] + (face_down[first] - 1,) + face_down[first + 1:]
+        remaining = remaining[:second] + (remaining[second] - 1,) + remaining[second + 1:]
+        return self.place(second, face_down, remaining)
+
+    def run(self, progress=None, checkpoint=None):
+        """
+        Cuenta todas las reparticiones ganadoras
+
+        Args:
+            progress: Función opcional llamada con (ramas hechas, ramas
+                totales, ganadoras hasta ahora) tras cada rama
+            checkpoint (str): Ruta de un punto de control JSON; si existe se
+                retoma desde él y se actualiza tras cada rama
+
+        Returns:
+            int: Reparticiones distintas por valor que terminan con éxito
+        """
+        if checkpoint:
+            self.load_checkpoint(checkpoint)
+        branches = self.iter_branches()
+        for done, branch in enumerate(branches, 1):
+            if branch not in self.branches:
+                self.branches[branch] = self.count_branch(branch)
+                if checkpoint:
+                    self.save_checkpoint(checkpoint)
+            if progress:
+                progress(done, len(branches), sum(self.branches.values()))
+        return sum(self.branches[branch] for branch in branches)
+
+    def load_checkpoint(self, path):
+        """
+        Retoma las ramas terminadas de un punto de control
+
+        Args:
+            path (str): Ruta del archivo JSON
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as checkpoint_file:
+            data = json.load(checkpoint_file)
+        if (data.get('version') != CHECKPOINT_VERSION or data['num_piles'] != self.num_piles
+                or data['cards_per_pile'] != self.cards_per_pile):
+            raise ValueError(f"El punto de control {path} es de otra configuración")
+        for first, second, wins in data['branches']:
+            self.branches[(first, second)] = wins
+
+    def save_checkpoint(self, path):
+        """
+        Guarda las ramas terminadas sin dejar el archivo a medias
+
+        Args:
+            path (str): Ruta del archivo JSON
+        """
+        data = {
+            'version': CHECKPOINT_VERSION,
+            'num_piles': self.num_piles,
+            'cards_per_pile': self.cards_per_pile,
+            'branches': [[first, second, wins] for (first, second), wins in self.branches.items()],
+        }
+        partial = path + ".tmp"
+        with open(partial, "w", encoding="utf-8") as checkpoint_file:
+            json.dump(data, checkpoint_file)
+        os.replace(partial, path)
+
+    def to_dict(self, wins):
+        """
+        Resumen del conteo
+
+        Args:
+            wins (int): Reparticiones ganadoras por valor (lo que devuelve run)
+
+        Returns:
+            dict: Conteos por valor y con palos, probabilidad y estados recorridos
+        """
+        n, k = self.num_piles, self.cards_per_pile
+        deals = count_distinct_deals(n, k)
+        suit_orders = factorial(k) ** n
+        return {
+            'num_piles': n,
+            'cards_per_pile': k,
+            'winning_deals': wins,
+            'distinct_deals': deals,
+            'winning_card_orders': wins * suit_orders,
+            'card_orders': deals * suit_orders,
+            'probability': str(Fraction(wins, deals)),
+            'states_visited': self.visited,
+        }
+
+
+def count_winning_deals(num_piles, cards_per_pile, progress=None, checkpoint=None):
+    """
+    Reparticiones distintas por valor que terminan con éxito
+
+    Args:
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+        progress: Función opcional de progreso (ver ExhaustiveCounter.run)
+        checkpoint (str): Ruta opcional del punto de control
+
+    Returns:
+        int: Reparticiones ganadoras
+    """
+    return ExhaustiveCounter(num_piles, cards_per_pile).run(progress, checkpoint)
+
+
+def iter_distinct_deals(num_piles, cards_per_pile):
+    """
+    Todas las reparticiones distintas por valor, en orden lexicográfico
+
+    Args:
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+
+    Yields:
+        list: Valor numérico de cada carta (la misma lista, modificada en su lugar)
+    """
+    remaining = [0] + [cards_per_pile] * num_piles
+    deal = [0] * (num_piles * cards_per_pile)
+
+    def place(position):
+        if position == len(deal):
+            yield deal
+            return
+        for value in range(1, num_piles + 1):
+            if remaining[value]:
+                remaining[value] -= 1
+                deal[position] = value
+                yield from place(position + 1)
+                remaining[value] += 1
+
+    return place(0)
+
+
+def count_by_playing(num_piles, cards_per_pile, limit=MAX_ENUMERATED_DEALS):
+    """
+    Reparticiones ganadoras jugando cada una con el simulador (fuerza bruta)
+
+    Args:
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+        limit (int): Máximo de reparticiones a jugar
+
+    Returns:
+        int: Reparticiones ganadoras
+    """
+    total = count_distinct_deals(num_piles, cards_per_pile)
+    if total > limit:
+        raise ValueError(f"{total} reparticiones superan el límite de {limit}")
+    return sum(play_deal(deal, num_piles, cards_per_pile)[SUCCESS]
+               for deal in iter_distinct_deals(num_piles, cards_per_pile))
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Conteo exacto de reparticiones ganadoras")
+    parser.add_argument("piles", type=int, nargs="?", default=NUM_PILES)
+    parser.add_argument("cards_per_pile", type=int, nargs="?", default=CARDS_PER_PILE)
+    parser.add_argument("--checkpoint", help="punto de control JSON para retomar el conteo")
+    parser.add_argument("--check", action="store_true",
+                        help="contrastar con la fórmula exacta y, si es pequeña, con el simulador")
+    parser.add_argument("--json", action="store_true", help="salida en JSON")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+
+    def progress(done, total, wins):
+        elapsed = time.perf_counter() - start
+        print(f"\r{done}/{total} ramas  {wins} ganadoras  {elapsed:.1f} s",
+              end="", file=sys.stderr, flush=True)
+
+    counter = ExhaustiveCounter(args.piles, args.cards_per_pile)
+    wins = counter.run(progress, args.checkpoint)
+    print(file=sys.stderr)
+    summary = counter.to_dict(wins)
+    summary['seconds'] = time.perf_counter() - start
+    mismatches = 0
+    if args.check:
+        exact = success_probability(args.piles, args.cards_per_pile)
+        summary['formula_probability'] = str(exact)
+        mismatches = exact != Fraction(wins, summary['distinct_deals'])
+        # La fuerza bruta solo se intenta en configuraciones pequeñas
+        if summary['distinct_deals'] <= MAX_ENUMERATED_DEALS:
+            played = count_by_playing(args.piles, args.cards_per_pile)
+            summary['played_wins'] = played
+            mismatches += played != wins
+
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        for name, value in summary.items():
+            print(f"{name}: {value}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
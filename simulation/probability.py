@@ -0,0 +1,162 @@
+"""
+Probabilidad exacta de éxito para cualquier configuración de pilas
+
+El predictor de simulation.engine reduce cada consulta a dos condiciones
+sobre las últimas cartas de las pilas (ver predict_deal): la del centro,
+que se pierde boca abajo, debe ser del valor del centro, y las de las demás
+pilas, vistas como aristas pila -> pila de su valor, deben formar un árbol
+con raíz en el centro.
+
+Para la segunda condición se usa un conteo clásico: entre todas las
+funciones de las n-1 pilas en las n pilas en que cada pila v recibe m_v
+aristas, hay (n-1)! / prod(m_v!) y de ellas (n-2)! * m_c / prod(m_v!) son
+árboles con raíz en el centro c. La proporción es m_c / (n-1) y, como todas
+las secuencias con los mismos m_v son igual de probables al mezclar, la
+probabilidad del árbol es E[m_c] / (n-1). Por linealidad de la esperanza,
+E[m_c] es n-1 veces la probabilidad de que una última carta cualquiera sea
+del valor del centro. Todo se calcula con fracciones exactas en tiempo
+constante, sin importar el tamaño de la baraja.
+"""
+from fractions import Fraction
+from math import factorial
+from simulation.engine import predict_deal
+from utils.constants import NUM_PILES, CARDS_PER_PILE
+
+# Tope de reparticiones distintas para la verificación por enumeración
+MAX_ENUMERATED_DEALS = 2000000
+
+
+def success_probability(num_piles, cards_per_pile):
+    """
+    Probabilidad exacta de que una consulta termine con éxito
+
+    Args:
+        num_piles (int): Número de pilas (y de valores distintos)
+        cards_per_pile (int): Cartas por pila (y copias de cada valor)
+
+    Returns:
+        Fraction: Probabilidad de éxito
+    """
+    if num_piles < 1 or cards_per_pile < 1:
+        raise ValueError("Se necesita al menos una pila con al menos una carta")
+    n, k = num_piles, cards_per_pile
+    if n == 1:
+        return Fraction(1)
+
+    if k == 1:
+        # No se pierde ninguna carta: la del centro es cualquiera y cada una
+        # de las demás es la única del valor del centro con probabilidad 1/n
+        center_ok = Fraction(1)
+        root_edge = Fraction(1, n)
+    else:
+        # La carta perdida debe ser una de las k del centro; quedan k-1 de
+        # ese valor entre las n*k-1 cartas restantes
+        center_ok = Fraction(k, n * k)
+        root_edge = Fraction(k - 1, n * k - 1)
+
+    expected_roots = (n - 1) * root_edge
+    return center_ok * expected_roots / (n - 1)
+
+
+def closed_form(num_piles, cards_per_pile):
+    """
+    Fórmula cerrada equivalente a success_probability, para contrastarla
+
+    Args:
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+
+    Returns:
+        Fraction: (k-1) / ((k*n-1) * n), o 1/n si k = 1
+    """
+    n, k = num_piles, cards_per_pile
+    if n == 1:
+        return Fraction(1)
+    if k == 1:
+        return Fraction(1, n)
+    return Fraction(k - 1, (k * n - 1) * n)
+
+
+def count_distinct_deals(num_piles, cards_per_pile):
+    """
+    Número de reparticiones distintas por valor
+
+    Args:
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+
+    Returns:
+        int: (n*k)! / (k!)^n
+    """
+    return factorial(num_piles * cards_per_pile) // factorial(cards_per_pile) ** num_piles
+
+
+def enumerate_probability(num_piles, cards_per_pile, limit=MAX_ENUMERATED_DEALS):
+    """
+    Probabilidad exacta recorriendo todas las reparticiones distintas
+
+    Cada repartición distinta por valor es igual de probable, así que basta
+    contar las exitosas. Solo sirve para configuraciones pequeñas.
+
+    Args:
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+        limit (int): Máximo de reparticiones a recorrer
+
+    Returns:
+        Fraction: Probabilidad de éxito
+    """
+    total = count_distinct_deals(num_piles, cards_per_pile)
+    if total > limit:
+        raise ValueError(f"{total} reparticiones superan el límite de {limit}")
+
+    remaining = [0] + [cards_per_pile] * num_piles
+    deal = [0] * (num_piles * cards_per_pile)
+    successes = 0
+
+    def place(position):
+        nonlocal successes
+        if position == len(deal):
+            successes += predict_deal(deal, num_piles, cards_per_pile)
+            return
+        for value in range(1, num_piles + 1):
+            if remaining[value]:
+                remaining[value] -= 1
+                deal[position] = value
+                place(position + 1)
+                remaining[value] += 1
+
+    place(0)
+    return Fraction(successes, total)
+
+
+def find_configurations(target, max_piles=13, max_cards_per_pile=8, count=5):
+    """
+    Busca las configuraciones cuya probabilidad de éxito se acerca más a una dada
+
+    Args:
+        target (float): Probabilidad de éxito deseada
+        max_piles (int): Máximo de pilas a considerar
+        max_cards_per_pile (int): Máximo de cartas por pila a considerar
+        count (int): Cantidad de configuraciones a devolver
+
+    Returns:
+        list: Lista de (pilas, cartas por pila, Fraction) de la más cercana a
+            la más lejana
+    """
+    target = Fraction(target)
+    candidates = [(num_piles, cards_per_pile, success_probability(num_piles, cards_per_pile))
+                  for num_piles in range(2, max_piles + 1)
+                  for cards_per_pile in range(1, max_cards_per_pile + 1)]
+    candidates.sort(key=lambda candidate: (abs(candidate[2] - target), candidate[:2]))
+    return candidates[:count]
+
+
+def main():
+    """Muestra la probabilidad exacta de la configuración estándar"""
+    probability = success_probability(NUM_PILES, CARDS_PER_PILE)
+    print(f"Probabilidad de éxito: {probability} ({float(probability):.6%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Ejecución de simulaciones repartida en varios procesos
+
+Las consultas se dividen en bloques de tamaño fijo y cada bloque usa su
+propia semilla derivada de la semilla maestra y del número de bloque. Así
+el resultado combinado es idéntico bit a bit sin importar cuántos procesos
+se usen ni en qué orden terminen.
+"""
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from simulation.engine import SimulationSummary, run_simulation
+from utils.constants import NUM_PILES, CARDS_PER_PILE
+from utils.rng import create_rng
+
+DEFAULT_CHUNK_SIZE = 20000
+
+
+def derive_seed(master_seed, index):
+    """
+    Deriva la semilla de un bloque a partir de la semilla maestra
+
+    Args:
+        master_seed (int): Semilla maestra de la ejecución
+        index (int): Número de bloque
+
+    Returns:
+        int: Semilla de 64 bits del bloque
+    """
+    digest = hashlib.sha256(f"{master_seed}:{index}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def split_chunks(num_deals, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Divide las consultas en bloques de tamaño fijo
+
+    Args:
+        num_deals (int): Número total de consultas
+        chunk_size (int): Consultas por bloque
+
+    Returns:
+        list: Cantidad de consultas de cada bloque
+    """
+    full, rest = divmod(num_deals, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+def run_chunk(task):
+    """
+    Simula un bloque con su propia semilla
+
+    Args:
+        task (tuple): (semilla, consultas, pilas, cartas por pila, generador,
+            si se acumulan distribuciones)
+
+    Returns:
+        SimulationSummary: Resumen del bloque
+    """
+    seed, num_deals, num_piles, cards_per_pile, backend, detailed = task
+    return run_simulation(num_deals, create_rng(seed, backend), num_piles, cards_per_pile,
+                          detailed=detailed)
+
+
+def run_parallel(num_deals, master_seed=0, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                 num_piles=NUM_PILES, cards_per_pile=CARDS_PER_PILE, backend="random",
+                 detailed=False):
+    """
+    Simula consultas repartiéndolas entre varios procesos
+
+    Args:
+        num_deals (int): Número total de consultas
+        master_seed (int): Semilla maestra
+        workers (int): Procesos a usar (por defecto uno por núcleo)
+        chunk_size (int): Consultas por bloque
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+        backend (str): Generador de cada bloque ("random" o "numpy")
+        detailed (bool): Acumular también las distribuciones de resultados
+
+    Returns:
+        SimulationSummary: Resumen combinado de todos los bloques
+    """
+    tasks = [(derive_seed(master_seed, index), size, num_piles, cards_per_pile, backend, detailed)
+             for index, size in enumerate(split_chunks(num_deals, chunk_size))]
+    workers = workers or os.cpu_count() or 1
+
+    summary = SimulationSummary(num_piles, cards_per_pile, detailed)
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            summary.merge(run_chunk(task))
+        return summary
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        for partial in executor.map(run_chunk, tasks):
+            summary.merge(partial)
+    return summary
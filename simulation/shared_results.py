@@ -0,0 +1,217 @@
+"""
+Resultados por consulta en memoria compartida
+
+Con muchos millones de consultas, devolver cada resultado desde los
+procesos hijos por pickle cuesta más que jugarlas. Aquí el proceso padre
+reserva un bloque de multiprocessing.shared_memory con tres columnas de un
+byte por consulta y cada hijo escribe su tramo directamente:
+
+    success[i]   1 si la consulta i terminó con éxito
+    revealed[i]  cartas reveladas
+    end_pile[i]  pila donde terminó
+
+Los bloques y sus semillas son los de simulation.runner, así que la
+consulta i es la misma sin importar cuántos procesos se usen. El padre lee
+las columnas sin copiarlas (memoryview, o arreglos de NumPy si está
+instalado).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from simulation.engine import iter_deals, play_deal, SUCCESS, REVEALED, END_PILE
+from simulation.runner import DEFAULT_CHUNK_SIZE, derive_seed, split_chunks
+from utils.constants import NUM_PILES, CARDS_PER_PILE
+from utils.rng import create_rng
+
+COLUMNS = ("success", "revealed", "end_pile")
+# Bytes que se copian a la vez al contar sin NumPy
+COUNT_SLICE = 1 << 20
+
+
+def fill_chunk(buffer, num_deals, start, count, seed, num_piles, cards_per_pile, backend):
+    """
+    Juega un bloque y escribe sus resultados en las columnas
+
+    Args:
+        buffer (memoryview): Bloque con las tres columnas seguidas
+        num_deals (int): Consultas totales (largo de cada columna)
+        start (int): Primera consulta del bloque
+        count (int): Consultas del bloque
+        seed (int): Semilla del bloque
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+        backend (str): Generador ("random" o "numpy")
+    """
+    success = buffer[start:start + count]
+    revealed = buffer[num_deals + start:num_deals + start + count]
+    end_pile = buffer[2 * num_deals + start:2 * num_deals + start + count]
+    deals = iter_deals(count, create_rng(seed, backend), num_piles, cards_per_pile)
+    for index, deal in enumerate(deals):
+        outcome = play_deal(deal, num_piles, cards_per_pile)
+        success[index] = outcome[SUCCESS]
+        revealed[index] = outcome[REVEALED]
+        end_pile[index] = outcome[END_PILE]
+
+
+def count_values(view, num_values):
+    """
+    Cuenta cuántas veces aparece cada byte en una columna
+
+    Recorre la columna por tramos para no copiarla entera.
+
+    Args:
+        view (memoryview): Columna de un byte por consulta
+        num_values (int): Los valores posibles son 0..num_values-1
+
+    Returns:
+        list: Apariciones de cada valor
+    """
+    counts = [0] * num_values
+    for start in range(0, len(view), COUNT_SLICE):
+        piece = bytes(view[start:start + COUNT_SLICE])
+        for value in range(num_values):
+            counts[value] += piece.count(value)
+    return counts
+
+
+def run_shared_chunk(task):
+    """
+    Simula un bloque escribiendo en la memoria compartida (proceso hijo)
+
+    Args:
+        task (tuple): (nombre del bloque, consultas totales, primera consulta,
+            consultas del bloque, semilla, pilas, cartas por pila, generador)
+
+    Returns:
+        int: Consultas escritas
+    """
+    name, num_deals, start, count, seed, num_piles, cards_per_pile, backend = task
+    # Los hijos comparten el resource_tracker del padre, que es quien libera el bloque
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        fill_chunk(block.buf, num_deals, start, count, seed, num_piles, cards_per_pile, backend)
+    finally:
+        block.close()
+    return count
+
+
+class OutcomeBuffer:
+    def __init__(self, num_deals, num_piles=NUM_PILES, cards_per_pile=CARDS_PER_PILE):
+        """
+        Reserva las columnas de resultados en memoria compartida
+
+        Args:
+            num_deals (int): Consultas a guardar
+            num_piles (int): Número de pilas
+            cards_per_pile (int): Cartas por pila
+        """
+        if num_piles * cards_per_pile > 255:
+            raise ValueError("Las cartas reveladas no caben en un byte")
+        self.num_deals = num_deals
+        self.num_piles = num_piles
+        self.cards_per_pile = cards_per_pile
+        self.block = shared_memory.SharedMemory(create=True, size=max(3 * num_deals, 1))
+        # Una vista por columna, creada una sola vez y liberada en close()
+        self.views = {name: self.block.buf[index * num_deals:(index + 1) * num_deals]
+                      for index, name in enumerate(COLUMNS)}
+        self.closed = False
+
+    def column(self, name):
+        """
+        Una columna sin copiarla
+
+        Args:
+            name (str): "success", "revealed" o "end_pile"
+
+        Returns:
+            memoryview: Un byte por consulta
+        """
+        return self.views[name]
+
+    def as_numpy(self):
+        """
+        Las columnas como arreglos de NumPy que comparten la memoria
+
+        Returns:
+            dict: Nombre de columna -> numpy.ndarray de uint8; hay que
+                soltarlos antes de llamar a close()
+        """
+        import numpy
+
+        return {name: numpy.frombuffer(self.column(name), dtype=numpy.uint8) for name in COLUMNS}
+
+    def summary(self):
+        """
+        Totales calculados sobre las columnas
+
+        Returns:
+            dict: Consultas, éxitos, promedio de reveladas y conteo por pila final
+        """
+        successes = count_values(self.column("success"), 2)[1]
+        revealed = count_values(self.column("revealed"), self.num_piles * self.cards_per_pile + 1)
+        total_revealed = sum(value * count for value, count in enumerate(revealed))
+        return {
+            'deals': self.num_deals,
+            'successes': successes,
+            'success_rate': successes / self.num_deals if self.num_deals else 0.0,
+            'mean_revealed': total_revealed / self.num_deals if self.num_deals else 0.0,
+            'end_piles': count_values(self.column("end_pile"), self.num_piles),
+        }
+
+    def close(self):
+        """Libera las vistas y el bloque de memoria compartida; llamarlo de nuevo no hace nada"""
+        if self.closed:
+            return
+        # Primero se borra el nombre, para no dejar el bloque huérfano aunque
+        # alguien siga usando las columnas
+        self.block.unlink()
+        self.closed = True
+        for view in self.views.values():
+            view.release()
+        self.block.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def run_parallel_outcomes(num_deals, master_seed=0, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                          num_piles=NUM_PILES, cards_per_pile=CARDS_PER_PILE, backend="random"):
+    """
+    Simula consultas en varios procesos guardando el resultado de cada una
+
+    Args:
+        num_deals (int): Número total de consultas
+        master_seed (int): Semilla maestra
+        workers (int): Procesos a usar (por defecto uno por núcleo)
+        chunk_size (int): Consultas por bloque
+        num_piles (int): Número de pilas
+        cards_per_pile (int): Cartas por pila
+        backend (str): Generador de cada bloque ("random" o "numpy")
+
+    Returns:
+        OutcomeBuffer: Resultados por consulta; hay que cerrarlo al terminar
+    """
+    results = OutcomeBuffer(num_deals, num_piles, cards_per_pile)
+    tasks = []
+    start = 0
+    for index, count in enumerate(split_chunks(num_deals, chunk_size)):
+        tasks.append((results.block.name, num_deals, start, count, derive_seed(master_seed, index),
+                      num_piles, cards_per_pile, backend))
+        start += count
+    workers = workers or os.cpu_count() or 1
+
+    try:
+        if workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                fill_chunk(results.block.buf, *task[1:])
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                for _ in executor.map(run_shared_chunk, tasks):
+                    pass
+    except BaseException:
+        results.close()
+        raise
+    return results
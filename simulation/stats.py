@@ -0,0 +1,267 @@
+"""
+Estadísticas acumuladas de memoria fija para simulaciones largas
+
+Todo lo que se mide en una consulta es un entero acotado por el tamaño de
+la baraja (cartas reveladas, colocaciones, pila final, momento en que sale
+cada rey), así que cada distribución se guarda como un histograma exacto de
+tamaño fijo y los momentos con el método de Welford. La memoria no depende
+del número de consultas y dos acumuladores se combinan sumando contadores,
+de modo que cada proceso puede llevar el suyo y unirlos al final.
+"""
+import math
+from utils.constants import NUM_PILES, CARDS_PER_PILE
+
+# Cuantil normal para intervalos de confianza del 95 %
+Z_95 = 1.959963984540054
+
+
+def wilson_interval(successes, trials, z=Z_95):
+    """
+    Intervalo de confianza de Wilson para una proporción
+
+    Args:
+        successes (int): Casos favorables
+        trials (int): Casos totales
+        z (float): Cuantil normal del nivel de confianza
+
+    Returns:
+        tuple: (límite inferior, límite superior)
+    """
+    if not trials:
+        return (0.0, 1.0)
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return (max(center - margin, 0.0), min(center + margin, 1.0))
+
+
+class RunningMoments:
+    def __init__(self):
+        """Inicializa media y varianza en línea vacías"""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        """
+        Incorpora un valor (método de Welford)
+
+        Args:
+            value (float): Valor observado
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """
+        Combina con otro acumulador (fórmula de Chan)
+
+        Args:
+            other (RunningMoments): Acumulador a incorporar
+
+        Returns:
+            RunningMoments: Este mismo acumulador
+        """
+        if not other.count:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        return self
+
+    @property
+    def variance(self):
+        """float: Varianza muestral"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        """float: Desviación estándar muestral"""
+        return math.sqrt(self.variance)
+
+    def confidence_interval(self, z=Z_95):
+        """
+        Intervalo de confianza normal de la media
+
+        Args:
+            z (float): Cuantil normal del nivel de confianza
+
+        Returns:
+            tuple: (límite inferior, límite superior)
+        """
+        margin = z * self.stddev / math.sqrt(self.count) if self.count else 0.0
+        return (self.mean - margin, self.mean + margin)
+
+
+class Histogram:
+    def __init__(self, size):
+        """
+        Inicializa un histograma de enteros 0..size-1
+
+        Args:
+            size (int): Cantidad de valores posibles
+        """
+        self.counts = [0] * size
+
+    def add(self, value, count=1):
+        """Cuenta un valor"""
+        self.counts[value] += count
+
+    def merge(self, other):
+        """
+        Suma los contadores de otro histograma del mismo tamaño
+
+        Args:
+            other (Histogram): Histograma a incorporar
+
+        Returns:
+            Histogram: Este mismo histograma
+        """
+        if len(other.counts) != len(self.counts):
+            raise ValueError("No se pueden combinar histogramas de tamaños distintos")
+        for value, count in enumerate(other.counts):
+            self.counts[value] += count
+        return self
+
+    @property
+    def total(self):
+        """int: Valores contados"""
+        return sum(self.counts)
+
+    def quantile(self, q):
+        """
+        Cuantil exacto (el menor valor con frecuencia acumulada >= q)
+
+        Args:
+            q (float): Probabilidad entre 0 y 1
+
+        Returns:
+            int or None: El valor, o None si el histograma está vacío
+        """
+        total = self.total
+        if not total:
+            return None
+        threshold = max(q * total, 1)
+        cumulative = 0
+        for value, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= threshold:
+                return value
+        return len(self.counts) - 1
+
+    def to_dict(self):
+        """
+        Resumen serializable del histograma
+
+        Returns:
+            dict: Frecuencias (sin los ceros finales) y cuartiles
+        """
+        counts = list(self.counts)
+        while counts and not counts[-1]:
+            counts.pop()
+        return {
+            'counts': counts,
+            'p25': self.quantile(0.25),
+            'median': self.quantile(0.5),
+            'p75': self.quantile(0.75),
+            'p99': self.quantile(0.99),
+        }
+
+
+class OutcomeStats:
+    def __init__(self, num_piles=NUM_PILES, cards_per_pile=CARDS_PER_PILE):
+        """
+        Inicializa las estadísticas de una configuración
+
+        Args:
+            num_piles (int): Número de pilas
+            cards_per_pile (int): Cartas por pila
+        """
+        self.num_piles = num_piles
+        self.cards_per_pile = cards_per_pile
+        size = num_piles * cards_per_pile
+        self.deals = 0
+        self.successes = 0
+        self.revealed = RunningMoments()
+        self.moves = RunningMoments()
+        # Cartas reveladas en las consultas fallidas
+        self.revealed_on_failure = Histogram(size + 1)
+        self.end_piles = Histogram(num_piles)
+        # Momento (número de carta revelada) en que sale el i-ésimo rey
+        self.king_steps = [Histogram(size + 1) for _ in range(cards_per_pile)]
+        self.kings_revealed = Histogram(cards_per_pile + 1)
+
+    def add(self, outcome):
+        """
+        Incorpora el resultado de una consulta
+
+        Args:
+            outcome (tuple): Tupla devuelta por simulation.engine.play_deal
+        """
+        success, revealed, moves, end_pile, kings = outcome
+        self.deals += 1
+        self.successes += success
+        self.revealed.add(revealed)
+        self.moves.add(moves)
+        if not success:
+            self.revealed_on_failure.counts[revealed] += 1
+        self.end_piles.counts[end_pile] += 1
+        for order, step in enumerate(kings):
+            self.king_steps[order].counts[step] += 1
+        self.kings_revealed.counts[len(kings)] += 1
+
+    def merge(self, other):
+        """
+        Combina con las estadísticas de otro proceso
+
+        Args:
+            other (OutcomeStats): Estadísticas a incorporar
+
+        Returns:
+            OutcomeStats: Estas mismas estadísticas
+        """
+        if (other.num_piles, other.cards_per_pile) != (self.num_piles, self.cards_per_pile):
+            raise ValueError("No se pueden combinar simulaciones de configuraciones distintas")
+        self.deals += other.deals
+        self.successes += other.successes
+        self.revealed.merge(other.revealed)
+        self.moves.merge(other.moves)
+        self.revealed_on_failure.merge(other.revealed_on_failure)
+        self.end_piles.merge(other.end_piles)
+        for mine, theirs in zip(self.king_steps, other.king_steps):
+            mine.merge(theirs)
+        self.kings_revealed.merge(other.kings_revealed)
+        return self
+
+    def to_dict(self):
+        """
+        Convierte las estadísticas en un diccionario serializable
+
+        Returns:
+            dict: Métricas e histogramas
+        """
+        return {
+            'deals': self.deals,
+            'successes': self.successes,
+            'success_rate': self.successes / self.deals if self.deals else 0.0,
+            'success_rate_ci95': wilson_interval(self.successes, self.deals),
+            'revealed': {
+                'mean': self.revealed.mean,
+                'stddev': self.revealed.stddev,
+                'mean_ci95': self.revealed.confidence_interval(),
+            },
+            'moves': {
+                'mean': self.moves.mean,
+                'stddev': self.moves.stddev,
+                'mean_ci95': self.moves.confidence_interval(),
+            },
+            'revealed_on_failure': self.revealed_on_failure.to_dict(),
+            'end_piles': self.end_piles.to_dict(),
+            'king_steps': [histogram.to_dict() for histogram in self.king_steps],
+            'kings_revealed': self.kings_revealed.to_dict(),
+        }
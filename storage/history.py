@@ -0,0 +1,310 @@
+"""
+Historial de consultas en SQLite
+
+Cada consulta terminada se guarda con su pregunta, la repartición, el
+resultado, la duración y las colocaciones. Las escrituras se encolan y un
+hilo de fondo las vuelca por lotes en una sola transacción, así que quien
+registra (el bucle de Tk o el simulador) nunca espera al disco. La base usa
+WAL para que las lecturas no bloqueen al escritor, e índices por fecha, por
+resultado y por el texto normalizado de la pregunta.
+
+El historial nunca interrumpe el juego: si la base no se puede abrir o una
+escritura falla, se registra el error con logging y el historial queda
+desactivado; las consultas siguientes se descartan sin avisar al llamador.
+"""
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from models.compact import card_code
+from utils.questions import normalize_question
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS consultations (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    question TEXT NOT NULL,
+    question_key TEXT NOT NULL,
+    seed INTEGER,
+    deal BLOB,
+    result TEXT,
+    duration REAL,
+    moves INTEGER
+);
+CREATE INDEX IF NOT EXISTS consultations_created ON consultations (created);
+CREATE INDEX IF NOT EXISTS consultations_result ON consultations (result, created);
+CREATE INDEX IF NOT EXISTS consultations_question ON consultations (question_key, created);
+"""
+
+COLUMNS = ("created", "question", "question_key", "seed", "deal", "result", "duration", "moves")
+INSERT = f"INSERT INTO consultations ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+def connect(path):
+    """
+    Abre la base y crea el esquema si falta
+
+    Args:
+        path (str): Ruta del archivo SQLite
+
+    Returns:
+        sqlite3.Connection: Conexión en modo WAL
+    """
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class HistoryStore:
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        """
+        Abre el historial y arranca el hilo escritor
+
+        Args:
+            path (str): Ruta del archivo SQLite
+            batch_size (int): Máximo de consultas por transacción
+            flush_interval (float): Segundos máximos que una consulta espera en la cola
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = queue.Queue()
+        # Primer error de la base; desde entonces el historial está desactivado
+        self.error = None
+        # Una conexión de lectura por hilo
+        self.readers = threading.local()
+        # Consulta en curso cuando se usa como GameController.recorder
+        self.current = None
+        self.writer = None
+        try:
+            # La primera conexión crea el esquema antes de que nadie lea
+            connect(path).close()
+        except sqlite3.Error as error:
+            self.disable(error)
+            return
+        self.writer = threading.Thread(target=self.write_loop, name="history-writer", daemon=True)
+        self.writer.start()
+
+    @property
+    def enabled(self):
+        """bool: Si el historial sigue guardando consultas"""
+        return self.error is None
+
+    def disable(self, error):
+        """
+        Desactiva el historial tras un error de la base, sin propagarlo
+
+        Args:
+            error (Exception): El error de sqlite3
+        """
+        if self.error is None:
+            self.error = error
+            logger.error("Historial desactivado (%s): %s", self.path, error)
+
+    def record(self, question, deal=None, result=None, duration=None, moves=None,
+               seed=None, created=None):
+        """
+        Encola una consulta para guardarla; no espera al disco
+
+        Args:
+            question (str): La pregunta al oráculo
+            deal (bytes): Códigos de carta en el orden repartido (ver models.compact)
+            result (str): "success", "failure" o None
+            duration (float): Segundos que duró la consulta
+            moves (int): Cartas colocadas
+            seed (int): Semilla de la mezcla, si se conoce
+            created (float): Instante de la consulta (por defecto, ahora)
+        """
+        if self.error is not None:
+            return
+        created = time.time() if created is None else created
+        self.pending.put((created, question, normalize_question(question), seed,
+                          deal, result, duration, moves))
+
+    def write_loop(self):
+        """Vuelca la cola a la base por lotes (corre en el hilo escritor)"""
+        try:
+            connection = connect(self.path)
+        except sqlite3.Error as error:
+            # Se sigue vaciando la cola para no dejar esperando a flush()
+            self.disable(error)
+            connection = None
+        try:
+            running = True
+            while running:
+                batch = []
+                flush_requests = []
+                item = self.pending.get()
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    # None pide terminar y un Event, avisar tras escribir
+                    if item is None:
+                        running = False
+                    elif isinstance(item, threading.Event):
+                        flush_requests.append(item)
+                    else:
+                        batch.append(item)
+                    if not running or flush_requests or len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self.pending.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        break
+                if batch and self.error is None:
+                    try:
+                        with connection:
+                            connection.executemany(INSERT, batch)
+                    except sqlite3.Error as error:
+                        self.disable(error)
+                for done in flush_requests:
+                    done.set()
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def flush(self, timeout=None):
+        """
+        Espera a que lo encolado hasta ahora quede escrito
+
+        Args:
+            timeout (float): Segundos máximos de espera
+
+        Returns:
+            bool: True si se completó el volcado
+        """
+        if self.writer is None:
+            return True
+        done = threading.Event()
+        self.pending.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Escribe lo pendiente y detiene el hilo escritor"""
+        if self.writer is not None and self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+        reader = getattr(self.readers, 'connection', None)
+        if reader is not None:
+            reader.close()
+            self.readers.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Interfaz de grabación que usa GameController.recorder
+
+    def on_start(self, question, cards):
+        """Comienza a medir una consulta"""
+        self.current = {
+            'question': question,
+            'deal': bytes(card_code(card) for card in cards),
+            'start': time.monotonic(),
+            'moves': 0,
+        }
+
+    def on_flip(self, pile_index, card_index):
+        """Las cartas volteadas no se guardan en el historial"""
+
+    def on_place(self, target_pile):
+        """Cuenta una colocación"""
+        if self.current is not None:
+            self.current['moves'] += 1
+
+    def on_undo(self):
+        """Descuenta la colocación deshecha"""
+        if self.current is not None:
+            self.current['moves'] -= 1
+
+    def on_redo(self):
+        """Vuelve a contar la colocación rehecha"""
+        self.on_place(None)
+
+    def on_result(self, result):
+        """Encola la consulta en curso con su resultado"""
+        if self.current is not None:
+            current, self.current = self.current, None
+            self.record(current['question'], current['deal'], result,
+                        time.monotonic() - current['start'], current['moves'])
+
+    # Consultas
+
+    def query(self, sql, parameters=()):
+        """
+        Ejecuta una lectura con una conexión propia del hilo que consulta
+
+        Args:
+            sql (str): Sentencia SELECT sobre consultations
+            parameters (tuple): Parámetros de la sentencia
+
+        Returns:
+            list: Filas como diccionarios
+        """
+        reader = getattr(self.readers, 'connection', None)
+        if reader is None:
+            reader = self.readers.connection = sqlite3.connect(self.path)
+            reader.row_factory = sqlite3.Row
+        return [dict(row) for row in reader.execute(sql, parameters)]
+
+    def between(self, start, end, limit=1000):
+        """
+        Consultas hechas entre dos instantes
+
+        Args:
+            start (float): Desde (time.time())
+            end (float): Hasta, sin incluir
+            limit (int): Máximo de filas
+
+        Returns:
+            list: Consultas de la más antigua a la más reciente
+        """
+        return self.query("SELECT * FROM consultations WHERE created >= ? AND created < ? "
+                          "ORDER BY created LIMIT ?", (start, end, limit))
+
+    def with_result(self, result, limit=1000):
+        """
+        Últimas consultas con un resultado dado
+
+        Args:
+            result (str): "success" o "failure"
+            limit (int): Máximo de filas
+
+        Returns:
+            list: Consultas de la más reciente a la más antigua
+        """
+        return self.query("SELECT * FROM consultations WHERE result = ? "
+                          "ORDER BY created DESC LIMIT ?", (result, limit))
+
+    def with_question(self, question, limit=1000):
+        """
+        Consultas con la misma pregunta, una vez normalizada
+
+        Args:
+            question (str): La pregunta a buscar
+            limit (int): Máximo de filas
+
+        Returns:
+            list: Consultas de la más reciente a la más antigua
+        """
+        return self.query("SELECT * FROM consultations WHERE question_key = ? "
+                          "ORDER BY created DESC LIMIT ?", (normalize_question(question), limit))
+
+    def count_by_result(self):
+        """
+        Cantidad de consultas por resultado
+
+        Returns:
+            dict: Resultado -> cantidad
+        """
+        rows = self.query("SELECT result, COUNT(*) AS total FROM consultations GROUP BY result")
+        return {row['result']: row['total'] for row in rows}
@@ -0,0 +1,343 @@
+"""
+Registro binario compacto de consultas y su reproducción
+
+Formato del archivo de registro:
+    cabecera   b"ORCL" + versión (1 byte)
+    registros  uno tras otro, cada uno:
+        longitud      u32  bytes del registro sin contar este campo
+        pregunta      u16  longitud en bytes (UTF-8)
+        eventos       u16  número de eventos
+        cartas        u8   cartas de la repartición
+        resultado     u8   0 = sin terminar, 1 = éxito, 2 = fracaso
+        texto de la pregunta
+        repartición   un byte por carta (código 0-51, ver models.compact)
+        eventos       dos bytes cada uno: (tipo << 7 | pila, índice de carta)
+
+Junto al registro se guarda un índice (misma ruta + ".idx") con el
+desplazamiento de cada consulta como u64, para saltar a la N-ésima sin leer
+las anteriores. Ambos archivos se leen con mmap. Si el índice falta o no
+llega hasta el final del registro se reconstruye con los prefijos de
+longitud.
+"""
+import mmap
+import os
+import struct
+from controllers.game_controller import GameController
+from models.compact import card_code, to_card
+
+MAGIC = b"ORCL"
+VERSION = 1
+FILE_HEADER = MAGIC + bytes([VERSION])
+
+RECORD_LENGTH = struct.Struct("<I")
+RECORD_HEADER = struct.Struct("<HHBB")
+INDEX_ENTRY = struct.Struct("<Q")
+
+FLIP = 0
+PLACE = 1
+
+RESULT_CODES = {None: 0, "success": 1, "failure": 2}
+RESULT_NAMES = {code: name for name, code in RESULT_CODES.items()}
+
+
+def scan_offsets(data):
+    """
+    Recorre el registro de longitud en longitud para armar su índice
+
+    Args:
+        data: bytes o mmap con el registro completo
+
+    Returns:
+        bytearray: Desplazamiento de cada consulta como u64
+    """
+    offsets = bytearray()
+    offset = len(FILE_HEADER)
+    while offset < len(data):
+        offsets += INDEX_ENTRY.pack(offset)
+        offset += RECORD_LENGTH.size + RECORD_LENGTH.unpack_from(data, offset)[0]
+    return offsets
+
+
+def index_matches(data, offsets):
+    """
+    Verifica que el índice cubra todas las consultas del registro
+
+    El último desplazamiento más la longitud de su registro tiene que ser el
+    final del archivo; si no, el índice falta, quedó corto o es de otro
+    registro.
+
+    Args:
+        data: bytes o mmap con el registro completo
+        offsets: Índice con los desplazamientos como u64
+
+    Returns:
+        bool: True si el índice puede usarse tal cual
+    """
+    if len(offsets) % INDEX_ENTRY.size:
+        return False
+    if not offsets:
+        return len(data) == len(FILE_HEADER)
+    last = INDEX_ENTRY.unpack_from(offsets, len(offsets) - INDEX_ENTRY.size)[0]
+    if last < len(FILE_HEADER) or last + RECORD_LENGTH.size > len(data):
+        return False
+    return last + RECORD_LENGTH.size + RECORD_LENGTH.unpack_from(data, last)[0] == len(data)
+
+
+class GameRecord:
+    def __init__(self, question, deal, events, result=None):
+        """
+        Inicializa una consulta registrada
+
+        Args:
+            question (str): La pregunta al oráculo
+            deal (bytes): Códigos de la baraja en el orden repartido
+            events (list): Lista de (tipo, pila, índice de carta)
+            result (str): "success", "failure" o None si no terminó
+        """
+        self.question = question
+        self.deal = deal
+        self.events = events
+        self.result = result
+
+    def pack(self):
+        """
+        Serializa el registro, incluido su prefijo de longitud
+
+        Returns:
+            bytes: Registro binario
+        """
+        question = self.question.encode("utf-8")
+        body = bytearray(RECORD_HEADER.pack(
+            len(question), len(self.events), len(self.deal), RESULT_CODES[self.result]))
+        body += question
+        body += bytes(self.deal)
+        for kind, pile_index, card_index in self.events:
+            body.append(kind << 7 | pile_index)
+            body.append(card_index)
+        return RECORD_LENGTH.pack(len(body)) + body
+
+    @classmethod
+    def unpack(cls, buffer, offset):
+        """
+        Lee un registro de un buffer
+
+        Args:
+            buffer: bytes, bytearray o mmap con el registro
+            offset (int): Posición del prefijo de longitud
+
+        Returns:
+            GameRecord: El registro leído
+        """
+        start = offset + RECORD_LENGTH.size
+        question_len, num_events, deal_len, result = RECORD_HEADER.unpack_from(buffer, start)
+        position = start + RECORD_HEADER.size
+        question = bytes(buffer[position:position + question_len]).decode("utf-8")
+        position += question_len
+        deal = bytes(buffer[position:position + deal_len])
+        position += deal_len
+        raw = buffer[position:position + 2 * num_events]
+        events = [(raw[i] >> 7, raw[i] & 0x7F, raw[i + 1]) for i in range(0, len(raw), 2)]
+        return cls(question, deal, events, RESULT_NAMES[result])
+
+    def replay(self, controller=None):
+        """
+        Reproduce la consulta sobre un GameController
+
+        Args:
+            controller (GameController): Controlador a usar (uno nuevo por defecto)
+
+        Returns:
+            GameController: Controlador con la partida reproducida
+        """
+        controller = controller or GameController()
+        controller.start_game(self.question, [to_card(code) for code in self.deal])
+        for kind, pile_index, card_index in self.events:
+            if kind == FLIP:
+                done = controller.flip_card(pile_index, card_index)
+            else:
+                done = controller.place_card(pile_index)
+            if not done:
+                raise ValueError(f"Evento inválido al reproducir: {(kind, pile_index, card_index)}")
+        if self.result is not None:
+            controller.get_result()
+        return controller
+
+
+class MoveLogWriter:
+    def __init__(self, path):
+        """
+        Abre un registro para agregar consultas al final
+
+        Args:
+            path (str): Ruta del archivo de registro
+        """
+        self.path = path
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(FILE_HEADER)
+            self.file.flush()
+        self.repair_index()
+        self.index = open(path + ".idx", "ab")
+        self.current = None
+        # Eventos quitados al deshacer, por colocación, para poder rehacerlos
+        self.undone = []
+
+    def repair_index(self):
+        """Reconstruye el índice si falta o no cubre todo el registro"""
+        index_path = self.path + ".idx"
+        offsets = b""
+        if os.path.exists(index_path):
+            with open(index_path, "rb") as index_file:
+                offsets = index_file.read()
+        with open(self.path, "rb") as log_file:
+            with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if index_matches(data, offsets):
+                    return
+                offsets = scan_offsets(data)
+        with open(index_path, "wb") as index_file:
+            index_file.write(offsets)
+
+    def write(self, record):
+        """
+        Agrega una consulta completa
+
+        Args:
+            record (GameRecord): La consulta a guardar
+        """
+        offset = self.file.tell()
+        self.file.write(record.pack())
+        self.index.write(INDEX_ENTRY.pack(offset))
+
+    # Interfaz de grabación que usa GameController.recorder
+
+    def on_start(self, question, cards):
+        """
+        Comienza a grabar una consulta
+
+        Args:
+            question (str): La pregunta al oráculo
+            cards (list): Cartas de la baraja en el orden repartido
+        """
+        self.current = GameRecord(question, bytes(card_code(card) for card in cards), [])
+        self.undone.clear()
+
+    def on_flip(self, pile_index, card_index):
+        """Graba que se volteó una carta"""
+        if self.current is not None:
+            self.current.events.append((FLIP, pile_index, card_index))
+
+    def on_place(self, target_pile):
+        """Graba que se colocó la carta seleccionada"""
+        if self.current is not None:
+            self.current.events.append((PLACE, target_pile, 0))
+            self.undone.clear()
+
+    def on_undo(self):
+        """Quita los eventos desde la última colocación, que se deshizo"""
+        if self.current is not None:
+            events = self.current.events
+            for position in range(len(events) - 1, -1, -1):
+                if events[position][0] == PLACE:
+                    self.undone.append(events[position:])
+                    del events[position:]
+                    break
+
+    def on_redo(self):
+        """Devuelve los eventos de la última colocación deshecha"""
+        if self.current is not None and self.undone:
+            self.current.events.extend(self.undone.pop())
+
+    def on_result(self, result):
+        """Cierra la consulta en curso y la escribe"""
+        if self.current is not None:
+            self.current.result = result
+            self.write(self.current)
+            self.current = None
+
+    def flush(self):
+        """Vuelca a disco lo escrito"""
+        self.file.flush()
+        self.index.flush()
+
+    def close(self):
+        """Cierra el registro"""
+        self.file.close()
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MoveLogReader:
+    def __init__(self, path):
+        """
+        Abre un registro con mmap para leerlo
+
+        Args:
+            path (str): Ruta del archivo de registro
+        """
+        self.path = path
+        with open(path, "rb") as log_file:
+            self.data = mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:len(FILE_HEADER)] != FILE_HEADER:
+            raise ValueError(f"{path} no es un registro de consultas")
+        self.offsets = self.load_index()
+
+    def load_index(self):
+        """
+        Mapea el índice de desplazamientos, o lo reconstruye si no cuadra
+
+        Returns:
+            Secuencia con el desplazamiento de cada consulta
+        """
+        index_path = self.path + ".idx"
+        if os.path.exists(index_path) and os.path.getsize(index_path):
+            with open(index_path, "rb") as index_file:
+                offsets = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            if index_matches(self.data, offsets):
+                return offsets
+            offsets.close()
+
+        # Sin índice válido: saltar de registro en registro por su longitud
+        return scan_offsets(self.data)
+
+    def __len__(self):
+        """Número de consultas registradas"""
+        return len(self.offsets) // INDEX_ENTRY.size
+
+    def __getitem__(self, game_index):
+        """
+        Lee la consulta N-ésima sin recorrer las anteriores
+
+        Args:
+            game_index (int): Número de consulta
+
+        Returns:
+            GameRecord: La consulta registrada
+        """
+        if game_index < 0:
+            game_index += len(self)
+        if not 0 <= game_index < len(self):
+            raise IndexError("consulta fuera de rango")
+        offset = INDEX_ENTRY.unpack_from(self.offsets, game_index * INDEX_ENTRY.size)[0]
+        return GameRecord.unpack(self.data, offset)
+
+    def __iter__(self):
+        """Recorre todas las consultas en orden"""
+        for game_index in range(len(self)):
+            yield self[game_index]
+
+    def close(self):
+        """Libera los mapeos de memoria"""
+        if isinstance(self.offsets, mmap.mmap):
+            self.offsets.close()
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,322 @@
+"""
+Planificador de animaciones con un único reloj de cuadros
+
+En lugar de encadenar llamadas sueltas a root.after, todo lo temporizado
+pasa por AnimationScheduler: las acciones diferidas, las interpolaciones
+(volteo de cartas, vuelo de una carta entre pilas) y los redibujados. En
+cada cuadro se ejecuta lo que venció, se avanzan las interpolaciones según
+el reloj real y se redibuja como máximo una vez. Si un cuadro llega tarde no
+se recuperan los perdidos: el siguiente se alinea al próximo múltiplo del
+intervalo.
+"""
+import heapq
+import itertools
+import time
+from utils.constants import CARD_WIDTH, CARD_HEIGHT, PILE_POSITIONS, ANIMATION_FPS
+
+
+class Tween:
+    def __init__(self, duration_ms, on_update=None, on_done=None):
+        """
+        Inicializa una interpolación de duración fija
+
+        Args:
+            duration_ms (int): Duración en milisegundos
+            on_update: Función llamada con el progreso (0.0 a 1.0) en cada cuadro
+            on_done: Función llamada al terminar
+        """
+        self.duration = max(duration_ms, 1) / 1000
+        self.on_update = on_update
+        self.on_done = on_done
+        self.start = None
+
+    def step(self, now):
+        """
+        Avanza la interpolación hasta el instante dado
+
+        Args:
+            now (float): Instante actual en segundos
+
+        Returns:
+            bool: True si la interpolación terminó
+        """
+        if self.start is None:
+            self.start = now
+        progress = min((now - self.start) / self.duration, 1.0)
+        self.update(progress)
+        return progress >= 1.0
+
+    def update(self, progress):
+        """Aplica el progreso; las subclases dibujan aquí"""
+        if self.on_update:
+            self.on_update(progress)
+
+    def finish(self):
+        """Se llama una vez al terminar"""
+        if self.on_done:
+            self.on_done()
+
+
+class CardFlight(Tween):
+    def __init__(self, canvas, card_renderer, card, from_pile, to_pile, duration_ms, on_done=None,
+                 target=None):
+        """
+        Vuelo de una carta desde una pila hasta otra
+
+        Args:
+            canvas: Canvas donde dibujar
+            card_renderer (CardRenderer): Renderizador de cartas
+            card (Card): La carta que vuela
+            from_pile (int): Pila de origen
+            to_pile (int): Pila de destino
+            duration_ms (int): Duración en milisegundos
+            on_done: Función llamada al aterrizar
+            target (tuple): (x, y) de llegada; por defecto la posición de la pila
+        """
+        super().__init__(duration_ms, on_done=on_done)
+        self.canvas = canvas
+        self.card_renderer = card_renderer
+        self.card = card
+        self.origin = PILE_POSITIONS[from_pile]
+        self.target = target or PILE_POSITIONS[to_pile]
+        self.items = None
+
+    def update(self, progress):
+        # Aceleración suave al salir y al llegar
+        eased = progress * progress * (3 - 2 * progress)
+        x = self.origin[0] + (self.target[0] - self.origin[0]) * eased
+        y = self.origin[1] + (self.target[1] - self.origin[1]) * eased
+        if self.items is None:
+            self.items = self.card_renderer.create_card(x, y, self.card, "flight", 0)
+        else:
+            self.card_renderer.move_card(self.items, x, y, self.card)
+
+    def finish(self):
+        if self.items is not None:
+            self.canvas.delete(*self.items)
+        super().finish()
+
+
+class CardFlip(Tween):
+    def __init__(self, canvas, items, x, y, duration_ms, on_done=None):
+        """
+        Volteo de una carta ya dibujada, encogiéndola y estirándola en X
+
+        Args:
+            canvas: Canvas donde dibujar
+            items (tuple): Ids de la carta (ver CardRenderer.create_card)
+            x (int): Centro X de la carta
+            y (int): Centro Y de la carta
+            duration_ms (int): Duración en milisegundos
+            on_done: Función llamada al terminar
+        """
+        super().__init__(duration_ms, on_done=on_done)
+        self.canvas = canvas
+        self.rect_id = items[0]
+        self.x = x
+        self.y = y
+
+    def update(self, progress):
+        half_width = max(abs(1 - 2 * progress), 0.05) * CARD_WIDTH / 2
+        half_height = CARD_HEIGHT // 2
+        self.canvas.coords(self.rect_id, self.x - half_width, self.y - half_height,
+                           self.x + half_width, self.y + half_height)
+
+
+class AnimationScheduler:
+    def __init__(self, root, render, fps=ANIMATION_FPS, clock=time.perf_counter):
+        """
+        Inicializa el planificador
+
+        Args:
+            root: Objeto con after(ms, función) y after_cancel(id), como tk.Tk
+            render: Función que redibuja el juego
+            fps (int): Cuadros por segundo del reloj
+            clock: Función que devuelve el instante actual en segundos
+        """
+        self.root = root
+        self.render = render
+        self.interval = 1 / fps
+        self.clock = clock
+        self.timers = []
+        self.sequence = itertools.count()
+        self.tweens = []
+        self.dirty = False
+        # Funciones a llamar justo después del próximo redibujado
+        self.post_render = []
+        self.after_id = None
+        self.ticking = False
+        self.next_frame = None
+        self.frames = 0
+        self.dropped_frames = 0
+
+    def request_render(self):
+        """Marca el juego para redibujarlo en el próximo cuadro"""
+        self.dirty = True
+        self.wake()
+
+    def after_render(self, callback):
+        """
+        Redibuja en el próximo cuadro y luego llama a una función
+
+        Sirve para leer lo que dibujó el renderizador (por ejemplo los ids y
+        la posición de una carta) después de un cambio en el estado.
+
+        Args:
+            callback: Función sin argumentos
+        """
+        self.post_render.append(callback)
+        self.request_render()
+
+    def call_later(self, delay_ms, callback):
+        """
+        Ejecuta una función en el primer cuadro tras el retraso dado
+
+        Args:
+            delay_ms (int): Retraso en milisegundos
+            callback: Función sin argumentos
+        """
+        heapq.heappush(self.timers, (self.clock() + delay_ms / 1000, next(self.sequence), callback))
+        self.wake()
+
+    def add_tween(self, tween):
+        """
+        Agrega una interpolación que avanza en cada cuadro
+
+        Args:
+            tween (Tween): La interpolación
+        """
+        self.tweens.append(tween)
+        self.wake()
+
+    @property
+    def busy(self):
+        """bool: Si quedan interpolaciones en curso o por empezar tras el redibujado"""
+        return bool(self.tweens or self.post_render)
+
+    def wake(self):
+        """Programa el próximo cuadro si el reloj estaba detenido"""
+        if self.after_id is None and not self.ticking:
+            self.next_frame = self.clock()
+            self.after_id = self.root.after(0, self.tick)
+
+    def stop(self):
+        """Detiene el reloj y descarta todo lo pendiente"""
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.timers.clear()
+        self.tweens.clear()
+        self.post_render.clear()
+        self.dirty = False
+
+    def tick(self):
+        """Procesa un cuadro y programa el siguiente si queda trabajo"""
+        self.after_id = None
+        self.ticking = True
+        try:
+            self.run_frame(self.clock())
+        finally:
+            self.ticking = False
+
+        if not (self.timers or self.tweens or self.dirty):
+            return
+
+        # Siguiente cuadro alineado al intervalo; los perdidos se descartan
+        self.next_frame += self.interval
+        now = self.clock()
+        if self.next_frame < now:
+            missed = int((now - self.next_frame) / self.interval) + 1
+            self.dropped_frames += missed
+            self.next_frame += missed * self.interval
+        if self.timers and not self.tweens and not self.dirty:
+            # Sin nada que animar se duerme hasta la próxima acción
+            self.next_frame = max(self.next_frame, self.timers[0][0])
+        delay_ms = max(int((self.next_frame - now) * 1000), 1)
+        self.after_id = self.root.after(delay_ms, self.tick)
+
+    def run_frame(self, now):
+        """
+        Ejecuta las acciones vencidas, redibuja y avanza las interpolaciones
+
+        Args:
+            now (float): Instante del cuadro en segundos
+        """
+        self.frames += 1
+
+        while self.timers and self.timers[0][0] <= now:
+            heapq.heappop(self.timers)[2]()
+
+        # Un solo redibujado por cuadro, antes de las interpolaciones para
+        # que estas queden encima del tablero
+        if self.dirty:
+            self.dirty = False
+            self.render()
+        if self.post_render:
+            callbacks, self.post_render = self.post_render, []
+            for callback in callbacks:
+                callback()
+
+        if self.tweens:
+            current, self.tweens = self.tweens, []
+            running = []
+            for tween in current:
+                if tween.step(now):
+                    tween.finish()
+                else:
+                    running.append(tween)
+            # finish() puede haber agregado interpolaciones nuevas
+            self.tweens = running + self.tweens
+
+
+class HeadlessLoop:
+    def __init__(self, realtime=False):
+        """
+        Bucle de eventos sin tkinter con after/after_cancel, para el planificador
+
+        Args:
+            realtime (bool): Si se espera de verdad entre eventos; si no, el
+                reloj es virtual y salta directo al próximo evento
+        """
+        self.realtime = realtime
+        self.timers = []
+        self.sequence = itertools.count()
+        self.cancelled = set()
+        self.virtual_now = 0.0
+
+    def now(self):
+        """
+        Instante actual en segundos; se usa como reloj del planificador
+
+        Returns:
+            float: Reloj real o virtual según el modo
+        """
+        return time.perf_counter() if self.realtime else self.virtual_now
+
+    def after(self, delay_ms, callback):
+        """Programa una función, como tk.Tk.after"""
+        timer_id = next(self.sequence)
+        heapq.heappush(self.timers, (self.now() + delay_ms / 1000, timer_id, callback))
+        return timer_id
+
+    def after_cancel(self, timer_id):
+        """Cancela una función programada, como tk.Tk.after_cancel"""
+        self.cancelled.add(timer_id)
+
+    def run(self, until=None):
+        """
+        Ejecuta los eventos en orden hasta que no quede ninguno
+
+        Args:
+            until: Función sin argumentos; se detiene cuando devuelve True
+        """
+        while self.timers and not (until and until()):
+            due, timer_id, callback = heapq.heappop(self.timers)
+            if timer_id in self.cancelled:
+                self.cancelled.discard(timer_id)
+                continue
+            if self.realtime:
+                time.sleep(max(due - self.now(), 0))
+            else:
+                self.virtual_now = max(self.virtual_now, due)
+            callback()
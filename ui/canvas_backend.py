@@ -0,0 +1,228 @@
+"""
+Backend de canvas sin pantalla para los renderizadores
+
+CardRenderer y PileRenderer solo usan este subconjunto de tkinter.Canvas:
+
+    create_rectangle(x1, y1, x2, y2, **opciones) -> id
+    create_text(x, y, **opciones) -> id
+    coords(item, *coordenadas)
+    itemconfigure(item, **opciones)
+    delete(*items)
+    tag_raise(elemento, encima_de)
+    tag_bind(tag, secuencia, función)
+
+RecordingCanvas implementa esa interfaz sin tkinter: guarda cada orden de
+dibujo en una lista compacta de tuplas y mantiene el estado de los
+elementos para poder exportar el tablero como SVG.
+"""
+import itertools
+from xml.sax.saxutils import escape, quoteattr
+from ui.pile_renderer import PileRenderer
+from utils.constants import COLORS, WINDOW_WIDTH, WINDOW_HEIGHT
+
+# Índices de los campos de cada elemento
+KIND = 0
+COORDS = 1
+OPTIONS = 2
+TAGS = 3
+
+
+def normalize_tags(tags):
+    """
+    Convierte la opción tags de tkinter en una tupla
+
+    Args:
+        tags: Cadena, tupla o None
+
+    Returns:
+        tuple: Etiquetas del elemento
+    """
+    if not tags:
+        return ()
+    if isinstance(tags, str):
+        return tuple(tags.split())
+    return tuple(tags)
+
+
+class RecordingCanvas:
+    def __init__(self, width=WINDOW_WIDTH, height=WINDOW_HEIGHT, bg=COLORS['bg_main'], record=True):
+        """
+        Inicializa el canvas vacío
+
+        Args:
+            width (int): Ancho en píxeles para la exportación
+            height (int): Alto en píxeles para la exportación
+            bg (str): Color de fondo
+            record (bool): Si se guarda la lista de órdenes de dibujo
+        """
+        self.width = width
+        self.height = height
+        self.bg = bg
+        self.record = record
+        self.commands = []
+        self.items = {}
+        self.tag_index = {}
+        self.bindings = {}
+        self.next_id = itertools.count(1)
+
+    def find_withtag(self, tag_or_id):
+        """
+        Busca elementos por id, etiqueta o "all"
+
+        Args:
+            tag_or_id: Id entero, etiqueta o "all"
+
+        Returns:
+            list: Ids encontrados en orden de creación
+        """
+        if isinstance(tag_or_id, int):
+            return [tag_or_id] if tag_or_id in self.items else []
+        if tag_or_id == "all":
+            return list(self.items)
+        return sorted(self.tag_index.get(tag_or_id, ()))
+
+    def create(self, kind, coords, options):
+        """Crea un elemento y registra la orden"""
+        item_id = next(self.next_id)
+        tags = normalize_tags(options.pop('tags', None))
+        self.items[item_id] = [kind, list(coords), options, tags]
+        for tag in tags:
+            self.tag_index.setdefault(tag, set()).add(item_id)
+        if self.record:
+            # Copia: itemconfigure actualiza las opciones del elemento en su lugar
+            self.commands.append(("create", kind, item_id, tuple(coords), dict(options), tags))
+        return item_id
+
+    def create_rectangle(self, *coords, **options):
+        """Crea un rectángulo, como en tkinter"""
+        return self.create("rectangle", coords, options)
+
+    def create_text(self, *coords, **options):
+        """Crea un texto, como en tkinter"""
+        return self.create("text", coords, options)
+
+    def coords(self, tag_or_id, *coords):
+        """Lee o cambia las coordenadas de un elemento, como en tkinter"""
+        item_ids = self.find_withtag(tag_or_id)
+        if not coords:
+            return list(self.items[item_ids[0]][COORDS]) if item_ids else []
+        for item_id in item_ids:
+            self.items[item_id][COORDS] = list(coords)
+        if self.record:
+            self.commands.append(("coords", tag_or_id, coords))
+
+    def itemconfigure(self, tag_or_id, **options):
+        """Cambia opciones de elementos, como en tkinter"""
+        for item_id in self.find_withtag(tag_or_id):
+            self.items[item_id][OPTIONS].update(options)
+        if self.record:
+            self.commands.append(("config", tag_or_id, options))
+
+    itemconfig = itemconfigure
+
+    def delete(self, *tags_or_ids):
+        """Borra elementos, como en tkinter"""
+        for tag_or_id in tags_or_ids:
+            if tag_or_id == "all":
+                self.items.clear()
+                self.tag_index.clear()
+                continue
+            for item_id in self.find_withtag(tag_or_id):
+                for tag in self.items.pop(item_id)[TAGS]:
+                    self.tag_index[tag].discard(item_id)
+        if self.record:
+            self.commands.append(("delete", tags_or_ids))
+
+    def tag_raise(self, tag_or_id, above=None):
+        """
+        Sube elementos justo encima de otro, o encima de todos, como en tkinter
+
+        Args:
+            tag_or_id: Id o etiqueta de los elementos a subir
+            above: Id o etiqueta del elemento que quedará debajo (None: todos)
+        """
+        moved = set(self.find_withtag(tag_or_id))
+        if moved:
+            entries = [entry for entry in self.items.items() if entry[0] not in moved]
+            moving = [entry for entry in self.items.items() if entry[0] in moved]
+            anchors = set(self.find_withtag(above)) if above is not None else ()
+            position = len(entries)
+            if anchors:
+                position = max(index for index, (item_id, _) in enumerate(entries)
+                               if item_id in anchors) + 1
+            entries[position:position] = moving
+            self.items = dict(entries)
+        if self.record:
+            self.commands.append(("raise", tag_or_id, above))
+
+    lift = tag_raise
+
+    def tag_bind(self, tag, sequence, callback):
+        """Asocia una función a un evento de una etiqueta"""
+        self.bindings[(tag, sequence)] = callback
+
+    def click(self, item_id):
+        """
+        Simula un clic sobre un elemento, llamando a sus bindings
+
+        Args:
+            item_id (int): Id del elemento clickeado
+        """
+        for tag in self.items[item_id][TAGS]:
+            callback = self.bindings.get((tag, "<Button-1>"))
+            if callback is not None:
+                callback(None)
+
+    def clear_commands(self):
+        """Vacía la lista de órdenes registradas"""
+        self.commands.clear()
+
+    def to_svg(self):
+        """
+        Exporta los elementos visibles como SVG
+
+        Returns:
+            str: Documento SVG con el tablero
+        """
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}">',
+            f'<rect width="100%" height="100%" fill={quoteattr(self.bg)}/>'
+        ]
+        for kind, coords, options, tags in self.items.values():
+            if options.get('state') == "hidden":
+                continue
+            if kind == "rectangle":
+                x1, y1, x2, y2 = coords
+                parts.append(
+                    f'<rect x="{min(x1, x2)}" y="{min(y1, y2)}" width="{abs(x2 - x1)}" '
+                    f'height="{abs(y2 - y1)}" fill={quoteattr(options.get("fill") or "none")} '
+                    f'stroke={quoteattr(options.get("outline", "black"))} '
+                    f'stroke-width="{options.get("width", 1)}"/>'
+                )
+            elif options.get('text'):
+                family, size, *style = options.get('font', ("Arial", 10))
+                weight = ' font-weight="bold"' if "bold" in style else ""
+                parts.append(
+                    f'<text x="{coords[0]}" y="{coords[1]}" text-anchor="middle" '
+                    f'dominant-baseline="central" font-family={quoteattr(family)} '
+                    f'font-size="{size}pt"{weight} fill={quoteattr(options.get("fill", "black"))}>'
+                    f'{escape(str(options["text"]))}</text>'
+                )
+        parts.append('</svg>')
+        return "\n".join(parts)
+
+
+def render_board_svg(piles, selected_card=None):
+    """
+    Dibuja un tablero completo sin pantalla y lo devuelve como SVG
+
+    Args:
+        piles (list): Lista de pilas con cartas
+        selected_card (Card): Carta actualmente seleccionada
+
+    Returns:
+        str: Documento SVG con el tablero
+    """
+    canvas = RecordingCanvas(record=False)
+    PileRenderer(canvas).draw_all_piles(piles, selected_card)
+    return canvas.to_svg()
@@ -4,12 +4,16 @@ Módulo para renderizar cartas en el canvas
 from utils.constants import COLORS, CARD_WIDTH, CARD_HEIGHT
 
 class CardRenderer:
+    # Opciones de dibujo por (valor, palo, boca arriba), compartidas por
+    # todos los renderizadores (por ejemplo, las mesas de ui.multi_table)
+    STYLES = {}
+    
     def __init__(self, canvas):
         """
         Inicializa el renderizador de cartas
         
         Args:
-            canvas: Canvas de tkinter donde dibujar
+            canvas: Canvas de tkinter (o ui.canvas_backend.RecordingCanvas) donde dibujar
         """
         self.canvas = canvas
     
@@ -29,20 +33,7 @@ class CardRenderer:
         Returns:
             str: Tag de la carta dibujada
         """
-        # Determinar colores
-        if card.face_up:
-            if card.is_red():
-                fill_color = "white"
-                text_color = COLORS['red_card']
-                border_color = COLORS['red_card']
-            else:
-                fill_color = "white"
-                text_color = "black"
-                border_color = "black"
-        else:
-            fill_color = COLORS['purple_card']
-            text_color = COLORS['gold']
-            border_color = COLORS['purple_border']
+        fill_color, text_color, border_color = self.card_colors(card)
         
         half_width = CARD_WIDTH // 2
         half_height = CARD_HEIGHT // 2
@@ -87,6 +78,169 @@ class CardRenderer:
         
         return f"card_{pile_index}_{card_index}"
     
+    def card_colors(self, card):
+        """
+        Colores con los que se dibuja una carta
+        
+        Args:
+            card (Card): La carta a dibujar
+            
+        Returns:
+            tuple: (relleno, texto, borde)
+        """
+        if card.face_up:
+            if card.is_red():
+                return "white", COLORS['red_card'], COLORS['red_card']
+            return "white", "black", "black"
+        return COLORS['purple_card'], COLORS['gold'], COLORS['purple_border']
+    
+    def card_style(self, card):
+        """
+        Opciones de itemconfigure de cada elemento de una carta
+        
+        Se calculan una sola vez por carta y cara, y se reutilizan.
+        
+        Args:
+            card (Card): La carta a dibujar
+            
+        Returns:
+            tuple: Opciones de (rectángulo, texto superior, texto inferior)
+        """
+        key = (card.value, card.suit, card.face_up)
+        style = self.STYLES.get(key)
+        if style is None:
+            fill_color, text_color, border_color = self.card_colors(card)
+            rect = {'fill': fill_color, 'outline': border_color}
+            if card.face_up:
+                top = {'text': card.value, 'font': ("Arial", 16, "bold"), 'fill': text_color}
+                bottom = {'text': card.suit, 'font': ("Arial", 24, "bold"), 'fill': text_color}
+            else:
+                # Carta boca abajo - mostrar símbolo místico
+                top = {'text': "✨", 'font': ("Arial", 28), 'fill': text_color}
+                bottom = {'text': ""}
+            style = self.STYLES[key] = (rect, top, bottom)
+        return style
+    
+    def create_card(self, x, y, card, pile_index, card_index):
+        """
+        Crea los elementos persistentes de una carta para actualizarlos luego
+        
+        Args:
+            x (int): Posición X
+            y (int): Posición Y
+            card (Card): La carta a dibujar
+            pile_index (int): Índice de la pila
+            card_index (int): Índice de la carta en la pila
+            
+        Returns:
+            tuple: Ids de (rectángulo, texto superior, texto inferior)
+        """
+        tags = (f"card_{pile_index}_{card_index}", f"pile_{pile_index}")
+        items = (
+            self.canvas.create_rectangle(0, 0, 0, 0, width=2, tags=tags),
+            self.canvas.create_text(x, y, tags=tags),
+            self.canvas.create_text(x, y, tags=tags)
+        )
+        self.update_card(items, x, y, card)
+        return items
+    
+    def update_card(self, items, x, y, card):
+        """
+        Actualiza los elementos de una carta ya creada con coords/itemconfig
+        
+        Args:
+            items (tuple): Ids devueltos por create_card
+            x (int): Posición X
+            y (int): Posición Y
+            card (Card): La carta a mostrar
+        """
+        rect_style, top_style, bottom_style = self.card_style(card)
+        rect_id, top_id, bottom_id = items
+        
+        self.move_card(items, x, y, card)
+        self.canvas.itemconfigure(rect_id, **rect_style)
+        self.canvas.itemconfigure(top_id, **top_style)
+        self.canvas.itemconfigure(bottom_id, **bottom_style)
+    
+    def move_card(self, items, x, y, card):
+        """
+        Mueve una carta ya creada sin cambiar su aspecto
+        
+        Args:
+            items (tuple): Ids devueltos por create_card
+            x (int): Posición X
+            y (int): Posición Y
+            card (Card): La carta mostrada
+        """
+        rect_id, top_id, bottom_id = items
+        half_width = CARD_WIDTH // 2
+        half_height = CARD_HEIGHT // 2
+        
+        self.canvas.coords(rect_id, x - half_width, y - half_height, x + half_width, y + half_height)
+        if card.face_up:
+            self.canvas.coords(top_id, x, y - 15)
+            self.canvas.coords(bottom_id, x, y + 15)
+        else:
+            self.canvas.coords(top_id, x, y)
+    
+    def create_stack(self, x, y, pile_index):
+        """
+        Crea los elementos de un bloque de cartas resumido (nivel de detalle)
+        
+        Args:
+            x (int): Posición X
+            y (int): Posición Y
+            pile_index (int): Índice de la pila
+            
+        Returns:
+            tuple: Ids de (sombra, bloque, insignia, texto de la insignia)
+        """
+        tags = (f"stack_{pile_index}", f"pile_{pile_index}")
+        return (
+            self.canvas.create_rectangle(0, 0, 0, 0, fill=COLORS['bg_secondary'],
+                                         outline=COLORS['purple_border'], width=2, tags=tags),
+            self.canvas.create_rectangle(0, 0, 0, 0, width=2, tags=tags),
+            self.canvas.create_rectangle(0, 0, 0, 0, fill=COLORS['gold'], outline="", tags=tags),
+            self.canvas.create_text(x, y, font=("Arial", 11, "bold"), fill=COLORS['bg_main'], tags=tags)
+        )
+    
+    def update_stack(self, items, x, y, num_cards, face_down):
+        """
+        Muestra un bloque de cartas como una sola carta con sombra y la cantidad
+        
+        Args:
+            items (tuple): Ids devueltos por create_stack
+            x (int): Posición X
+            y (int): Posición Y
+            num_cards (int): Cartas que resume el bloque (0 lo oculta)
+            face_down (int): Cuántas de ellas están boca abajo
+        """
+        if not num_cards:
+            for item in items:
+                self.canvas.itemconfigure(item, state="hidden")
+            return
+        
+        shadow_id, block_id, badge_id, text_id = items
+        half_width = CARD_WIDTH // 2
+        half_height = CARD_HEIGHT // 2
+        
+        # La sombra sugiere la profundidad del bloque
+        self.canvas.coords(shadow_id, x - half_width + 4, y - half_height + 4,
+                           x + half_width + 4, y + half_height + 4)
+        self.canvas.coords(block_id, x - half_width, y - half_height, x + half_width, y + half_height)
+        self.canvas.coords(badge_id, x + half_width - 34, y - half_height + 4,
+                           x + half_width - 4, y - half_height + 22)
+        self.canvas.coords(text_id, x + half_width - 19, y - half_height + 13)
+        
+        if face_down:
+            fill_color, border_color, text = COLORS['purple_card'], COLORS['purple_border'], f"×{face_down}"
+        else:
+            fill_color, border_color, text = "white", "black", f"+{num_cards}"
+        self.canvas.itemconfigure(block_id, fill=fill_color, outline=border_color)
+        self.canvas.itemconfigure(text_id, text=text)
+        for item in items:
+            self.canvas.itemconfigure(item, state="normal")
+    
     def draw_highlight(self, x, y):
         """
         Dibuja un resaltado alrededor de una pila
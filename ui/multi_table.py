@@ -0,0 +1,369 @@
+"""
+Varias mesas del oráculo en un solo proceso
+
+Cada mesa tiene su propio GameController y su canvas, y en la ventana su
+propia pregunta: se juega con clics sobre la pila resaltada, como en la
+ventana principal, o se deja en juego automático. Todas comparten un único
+AnimationScheduler: los volteos diferidos de todas las mesas y un solo
+temporizador para las automáticas van en el mismo reloj, y un solo
+redibujado por cuadro actualiza solo las mesas que cambiaron. Las opciones de dibujo de las cartas también se
+comparten (ver CardRenderer.STYLES). Así el costo crece con las cartas que
+cambian, no con cadenas de temporizadores por mesa.
+
+Uso:
+    python -m ui.multi_table --tables 4                # ventana de Tk
+    python -m ui.multi_table --tables 200 --headless   # sin pantalla, automáticas
+"""
+import argparse
+import random
+import time
+from controllers.game_controller import GameController
+from ui.animation import AnimationScheduler, HeadlessLoop
+from ui.pile_renderer import PileRenderer
+from utils.constants import ANIMATION_TIMES, AUTO_PLAY, CENTER_PILE, COLORS, WINDOW_WIDTH, WINDOW_HEIGHT
+
+
+class Table:
+    def __init__(self, canvas, rng=None):
+        """
+        Inicializa una mesa
+
+        Args:
+            canvas: Canvas de tkinter (o ui.canvas_backend.RecordingCanvas) de la mesa
+            rng: Generador, semilla o None (ver utils.rng.make_rng)
+        """
+        self.canvas = canvas
+        self.controller = GameController(rng)
+        self.renderer = PileRenderer(canvas)
+        self.result = None
+        self.dirty = False
+        # Si la mesa juega sola en los pasos compartidos del grupo
+        self.auto = False
+        # Función llamada con el índice de la pila clickeada (ver TableGroup.add_table)
+        self.on_pile_click = None
+
+    @property
+    def active(self):
+        """bool: Si la consulta de la mesa está en juego"""
+        return self.controller.state.state == "playing"
+
+    @property
+    def animating(self):
+        """bool: Si hay una colocación esperando su volteo"""
+        return self.controller.state.animating
+
+    def start(self, question, auto=False):
+        """
+        Empieza una consulta nueva y voltea la primera carta del centro
+
+        Args:
+            question (str): La pregunta al oráculo
+            auto (bool): Si la mesa juega sola
+        """
+        self.auto = auto
+        self.controller.reset()
+        self.controller.start_game(question)
+        self.controller.flip_card(CENTER_PILE, 0)
+        self.renderer.reset()
+        self.result = None
+        self.dirty = True
+
+    def advance(self, moves):
+        """
+        Juega unas cuantas colocaciones si la mesa está en automático
+
+        Args:
+            moves (int): Máximo de colocaciones
+
+        Returns:
+            bool: True si la mesa cambió
+        """
+        if not (self.active and self.auto) or self.animating:
+            return False
+        done = self.controller.auto_complete(moves)
+        if done and done[-1][1] is None:
+            self.result = self.controller.get_result()
+        self.dirty = True
+        return True
+
+    def render(self):
+        """Redibuja la mesa si cambió desde el último dibujo"""
+        if self.dirty:
+            state = self.controller.state
+            self.renderer.draw_all_piles(state.piles, state.selected_card, state.animating,
+                                         on_pile_click_callback=self.on_pile_click)
+            self.dirty = False
+
+
+class TableGroup:
+    def __init__(self, root, clock=time.perf_counter, frame_ms=ANIMATION_TIMES['auto_play_frame'],
+                 moves_per_frame=AUTO_PLAY['moves_per_frame']):
+        """
+        Inicializa un grupo de mesas con un reloj compartido
+
+        Args:
+            root: Objeto con after/after_cancel (tk.Tk o ui.animation.HeadlessLoop)
+            clock: Función que devuelve el instante actual en segundos
+            frame_ms (int): Milisegundos entre pasos de juego
+            moves_per_frame (int): Colocaciones por mesa en cada paso
+        """
+        self.tables = []
+        self.frame_ms = frame_ms
+        self.moves_per_frame = moves_per_frame
+        self.scheduler = AnimationScheduler(root, self.render, clock=clock)
+        self.stepping = False
+        self.steps = 0
+        # Función opcional llamada con (mesa, resultado) al terminar cada una
+        self.on_finished = None
+
+    def add_table(self, canvas, rng=None):
+        """
+        Agrega una mesa dibujada en el canvas dado
+
+        Args:
+            canvas: Canvas de la mesa
+            rng: Generador, semilla o None
+
+        Returns:
+            Table: La mesa creada
+        """
+        table = Table(canvas, rng)
+        table.on_pile_click = lambda pile_index: self.on_pile_clicked(table, pile_index)
+        self.tables.append(table)
+        return table
+
+    def start(self, table, question, auto=False):
+        """
+        Empieza una consulta en una mesa
+
+        Args:
+            table (Table): La mesa
+            question (str): La pregunta al oráculo
+            auto (bool): Si la mesa juega sola
+
+        Returns:
+            bool: True si empezó; no se puede mientras espera un volteo
+        """
+        if table.animating:
+            return False
+        table.start(question, auto)
+        self.scheduler.request_render()
+        if auto:
+            self.schedule_step()
+        return True
+
+    def auto_play(self, table):
+        """
+        Deja que una mesa en juego termine sola
+
+        Args:
+            table (Table): La mesa
+        """
+        if table.active:
+            table.auto = True
+            self.schedule_step()
+
+    def on_pile_clicked(self, table, pile_index):
+        """
+        Manejador cuando se hace clic en una pila de una mesa
+
+        Args:
+            table (Table): La mesa
+            pile_index (int): Índice de la pila clickeada
+        """
+        selected = table.controller.state.selected_card
+        if table.auto or table.animating or not selected:
+            return
+        if pile_index != selected.num_value - 1:
+            return
+        self.place_card(table, pile_index)
+
+    def place_card(self, table, target_pile):
+        """
+        Coloca la carta seleccionada y programa el volteo en el reloj compartido
+
+        Args:
+            table (Table): La mesa
+            target_pile (int): Índice de la pila objetivo
+        """
+        controller = table.controller
+        controller.state.animating = True
+        if not controller.place_card(target_pile):
+            controller.state.animating = False
+            return
+        table.dirty = True
+        self.scheduler.request_render()
+
+        if controller.check_game_over(target_pile):
+            self.scheduler.call_later(ANIMATION_TIMES['flip_delay'], lambda: self.finish(table))
+        else:
+            card_index = controller.get_next_card_to_flip(target_pile)
+            self.scheduler.call_later(ANIMATION_TIMES['place_card_delay'],
+                                      lambda: self.flip_next(table, target_pile, card_index))
+
+    def flip_next(self, table, pile_index, card_index):
+        """
+        Voltea la siguiente carta de una mesa tras colocar
+
+        Args:
+            table (Table): La mesa
+            pile_index (int): Índice de la pila
+            card_index (int): Índice de la carta
+        """
+        table.controller.flip_card(pile_index, card_index)
+        table.controller.state.animating = False
+        table.dirty = True
+        self.scheduler.request_render()
+
+    def finish(self, table):
+        """
+        Cierra la consulta de una mesa y avisa a on_finished
+
+        Args:
+            table (Table): La mesa
+        """
+        table.controller.state.animating = False
+        table.result = table.controller.get_result()
+        table.dirty = True
+        self.scheduler.request_render()
+        if self.on_finished:
+            self.on_finished(table, table.result)
+
+    def schedule_step(self):
+        """Programa el próximo paso compartido si no hay uno pendiente"""
+        if not self.stepping:
+            self.stepping = True
+            self.scheduler.call_later(self.frame_ms, self.step)
+
+    def step(self):
+        """Avanza todas las mesas activas en un solo paso"""
+        self.stepping = False
+        self.steps += 1
+        changed = False
+        for table in self.tables:
+            if table.advance(self.moves_per_frame):
+                changed = True
+                if table.result is not None and self.on_finished:
+                    self.on_finished(table, table.result)
+        if changed:
+            self.scheduler.request_render()
+        if any(table.active and table.auto for table in self.tables):
+            self.schedule_step()
+
+    def render(self):
+        """Redibuja solo las mesas que cambiaron (un único pase por cuadro)"""
+        for table in self.tables:
+            table.render()
+
+    @property
+    def finished(self):
+        """bool: Si ninguna mesa sigue en juego"""
+        return not any(table.active for table in self.tables)
+
+
+def run_headless(num_tables, question, seed=None):
+    """
+    Juega varias mesas sin pantalla con el reloj virtual
+
+    Args:
+        num_tables (int): Cantidad de mesas
+        question (str): La pregunta de todas las mesas
+        seed (int): Semilla para las mezclas
+
+    Returns:
+        TableGroup: El grupo con las mesas terminadas
+    """
+    from ui.canvas_backend import RecordingCanvas
+
+    loop = HeadlessLoop()
+    group = TableGroup(loop, clock=loop.now)
+    seeds = random.Random(seed)
+    for _ in range(num_tables):
+        table = group.add_table(RecordingCanvas(record=False), seeds.getrandbits(64))
+        group.start(table, question, auto=True)
+    loop.run()
+    return group
+
+
+def run_window(num_tables, columns, seed=None):
+    """
+    Muestra varias mesas en una sola ventana de Tk
+
+    Cada mesa tiene su propia pregunta y empieza su consulta por separado;
+    después se juega con clics o con el botón automático.
+
+    Args:
+        num_tables (int): Cantidad de mesas
+        columns (int): Mesas por fila
+        seed (int): Semilla para las mezclas
+    """
+    import tkinter as tk
+
+    root = tk.Tk()
+    root.title("Oráculo de Cartas Místico - Mesas")
+    root.configure(bg=COLORS['bg_main'])
+    group = TableGroup(root)
+    seeds = random.Random(seed)
+    status_labels = {}
+
+    def consult(table, entry):
+        question = entry.get().strip()
+        if not question:
+            status_labels[table].config(text="Escribe la pregunta de esta mesa")
+        elif group.start(table, question):
+            status_labels[table].config(text="")
+
+    def show_result(table, result):
+        status_labels[table].config(text="✨ Sí ✨" if result == "success" else "No")
+
+    group.on_finished = show_result
+    for index in range(num_tables):
+        frame = tk.Frame(root, bg=COLORS['bg_main'])
+        frame.grid(row=index // columns, column=index % columns)
+        bar = tk.Frame(frame, bg=COLORS['bg_secondary'])
+        bar.pack(side=tk.TOP, fill=tk.X)
+        entry = tk.Entry(bar, width=40, font=("Arial", 10), bg=COLORS['bg_main'], fg="white",
+                         insertbackground="white", relief=tk.FLAT)
+        entry.pack(side=tk.LEFT, padx=10, pady=8)
+        canvas = tk.Canvas(frame, width=WINDOW_WIDTH, height=WINDOW_HEIGHT - 100,
+                           bg=COLORS['bg_main'], highlightthickness=0)
+        canvas.pack(side=tk.TOP)
+        table = group.add_table(canvas, seeds.getrandbits(64))
+        entry.bind("<Return>", lambda event, table=table, entry=entry: consult(table, entry))
+        for text, color, command in (
+                ("🔮 Consultar", COLORS['purple_dark'], lambda table=table, entry=entry: consult(table, entry)),
+                ("⚡ Completar todo", COLORS['blue_button'], lambda table=table: group.auto_play(table))):
+            tk.Button(bar, text=text, font=("Arial", 9, "bold"), bg=color, fg="white",
+                      activeforeground="white", padx=10, pady=4, relief=tk.FLAT, cursor="hand2",
+                      command=command).pack(side=tk.LEFT, padx=3)
+        status_labels[table] = tk.Label(bar, text="", font=("Arial", 10, "bold"),
+                                        bg=COLORS['bg_secondary'], fg=COLORS['purple_light'])
+        status_labels[table].pack(side=tk.LEFT, padx=10)
+    root.mainloop()
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Varias mesas del Oráculo de Cartas")
+    parser.add_argument("--tables", type=int, default=4)
+    parser.add_argument("--question", default="¿Qué me depara el destino?",
+                        help="pregunta de todas las mesas sin pantalla")
+    parser.add_argument("--columns", type=int, default=2, help="mesas por fila en la ventana")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--headless", action="store_true", help="jugar sin pantalla y mostrar resultados")
+    args = parser.parse_args(argv)
+
+    if not args.headless:
+        run_window(args.tables, args.columns, args.seed)
+        return
+
+    start = time.perf_counter()
+    group = run_headless(args.tables, args.question, args.seed)
+    elapsed = time.perf_counter() - start
+    successes = sum(table.result == "success" for table in group.tables)
+    print(f"Mesas: {len(group.tables)}  éxitos: {successes}  pasos: {group.steps}  "
+          f"cuadros: {group.scheduler.frames}  tiempo: {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
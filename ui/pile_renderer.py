@@ -1,38 +1,127 @@
 """
 Módulo para renderizar pilas de cartas
+
+Las pilas cortas se dibujan carta por carta. Las más largas que
+RENDER_LOD['full_detail_max'] (por ejemplo al repartir pilas más grandes
+con Deck.distribute_to_piles) pasan a nivel de detalle reducido: las cartas
+de abajo se resumen en un bloque con la cantidad de cartas boca abajo y
+solo se dibujan completas las últimas cartas boca arriba, o la superior si
+está boca abajo. Así los elementos del canvas por pila no crecen con la
+profundidad de la pila.
 """
-from utils.constants import PILE_POSITIONS
+from utils.constants import PILE_POSITIONS, RENDER_LOD
 from ui.card_renderer import CardRenderer
 
 class PileRenderer:
-    def __init__(self, canvas):
+    def __init__(self, canvas, lod=RENDER_LOD):
         """
         Inicializa el renderizador de pilas
         
         Args:
-            canvas: Canvas de tkinter donde dibujar
+            canvas: Canvas de tkinter (o ui.canvas_backend.RecordingCanvas) donde dibujar
+            lod (dict): Nivel de detalle (ver utils.constants.RENDER_LOD)
         """
         self.canvas = canvas
         self.card_renderer = CardRenderer(canvas)
+        self.full_detail_max = lod['full_detail_max']
+        self.face_up_cards = lod['face_up_cards']
+        self.stack_offset = lod['stack_offset']
+        self.on_pile_click_callback = None
+        # Mientras se crea un tablero completo los elementos ya salen en orden
+        self.building = False
+        self.reset()
+    
+    def reset(self):
+        """
+        Limpia el canvas y olvida los elementos dibujados
+        
+        El siguiente draw_all_piles vuelve a crear el tablero completo; se
+        usa al preparar un tablero nuevo.
+        """
+        self.canvas.delete("all")
+        # Por pila: ids persistentes y lo que muestra cada carta dibujada
+        self.pile_items = []
+    
+    def create_pile(self, pile_index):
+        """
+        Crea los elementos persistentes de una pila vacía
+        
+        Args:
+            pile_index (int): Índice de la pila
+        
+        Returns:
+            dict: Ids de la etiqueta y el área, y las cartas dibujadas
+        """
+        x, y = PILE_POSITIONS[pile_index]
+        
+        label_text = "Centro" if pile_index == 12 else f"Pila {pile_index + 1}"
+        label_id = self.canvas.create_text(
+            x, y - 70,
+            text=label_text,
+            font=("Arial", 11, "bold"),
+            fill="#b19cd9",
+            tags=f"pile_label_{pile_index}"
+        )
+        
+        # Resaltado verde de la pila válida, oculto hasta que haga falta
+        area_id = self.canvas.create_rectangle(
+            x - 50, y - 65,
+            x + 50, y + 65,
+            outline="#10b981",
+            width=4,
+            state="hidden",
+            tags=(f"pile_area_{pile_index}", f"pile_{pile_index}")
+        )
+        
+        # Un solo binding por pila; el manejador decide si la pila es válida
+        self.canvas.tag_bind(f"pile_{pile_index}", "<Button-1>",
+                             lambda e, p=pile_index: self.on_pile_clicked(p))
+        
+        # En nivel de detalle reducido, 'stack' son los ids del bloque, 'base'
+        # el índice de la primera carta dibujada y 'top_y' su posición
+        return {'label': label_id, 'area': area_id, 'valid': False, 'slots': [], 'drawn': [],
+                'lod': False, 'stack': None, 'stack_shown': None, 'base': 0, 'top_y': y}
+    
+    def on_pile_clicked(self, pile_index):
+        """
+        Reenvía el clic al callback si la pila está resaltada
+        
+        Args:
+            pile_index (int): Índice de la pila clickeada
+        """
+        if self.pile_items[pile_index]['valid'] and self.on_pile_click_callback:
+            self.on_pile_click_callback(pile_index)
     
     def draw_all_piles(self, piles, selected_card=None, animating=False, on_pile_click_callback=None):
         """
         Dibuja todas las pilas en el canvas
         
+        Solo se tocan los elementos de las cartas que cambiaron desde el
+        dibujo anterior; el tablero se crea entero únicamente la primera vez
+        o cuando cambia el número de pilas.
+        
         Args:
             piles (list): Lista de pilas con cartas
             selected_card (Card): Carta actualmente seleccionada
             animating (bool): Si hay una animación en curso
             on_pile_click_callback: Función a llamar cuando se hace clic en una pila
         """
-        self.canvas.delete("all")
+        self.on_pile_click_callback = on_pile_click_callback
+        
+        if len(self.pile_items) != len(piles):
+            self.reset()
+            self.pile_items = [self.create_pile(pile_index) for pile_index in range(len(piles))]
+            self.building = True
         
-        for pile_index, pile in enumerate(piles):
-            self.draw_pile(pile_index, pile, selected_card, animating, on_pile_click_callback)
+        try:
+            for pile_index, pile in enumerate(piles):
+                self.draw_pile(pile_index, pile, selected_card, animating, on_pile_click_callback)
+        finally:
+            self.building = False
     
     def draw_pile(self, pile_index, pile, selected_card=None, animating=False, on_pile_click_callback=None):
         """
-        Dibuja una pila individual
+        Actualiza una pila individual
         
         Args:
             pile_index (int): Índice de la pila
@@ -41,17 +130,11 @@ class PileRenderer:
             animating (bool): Si hay animación en curso
             on_pile_click_callback: Función callback para clicks
         """
-        x, y = PILE_POSITIONS[pile_index]
+        if on_pile_click_callback is not None:
+            self.on_pile_click_callback = on_pile_click_callback
         
-        # Dibujar etiqueta de la pila ENCIMA de las cartas
-        label_text = "Centro" if pile_index == 12 else f"Pila {pile_index + 1}"
-        self.canvas.create_text(
-            x, y - 70,
-            text=label_text,
-            font=("Arial", 11, "bold"),
-            fill="#b19cd9",
-            tags=f"pile_label_{pile_index}"
-        )
+        x, y = PILE_POSITIONS[pile_index]
+        items = self.pile_items[pile_index]
         
         # Calcular si esta pila es la válida para colocar carta
         is_valid_pile = False
@@ -59,32 +142,178 @@ class PileRenderer:
             target_pile = selected_card.num_value - 1
             is_valid_pile = (pile_index == target_pile)
         
-        # Dibujar rectángulo de área de la pila (invisible pero clickeable)
-        if is_valid_pile:
-            # Dibujar resaltado verde
-            self.canvas.create_rectangle(
-                x - 50, y - 65,
-                x + 50, y + 65,
-                outline="#10b981",
-                width=4,
-                tags=f"pile_area_{pile_index}"
-            )
-            
-            # Hacer toda el área clickeable
-            self.canvas.tag_bind(f"pile_area_{pile_index}", "<Button-1>",
-                               lambda e, p=pile_index: on_pile_click_callback(p) if on_pile_click_callback else None)
+        if is_valid_pile != items['valid']:
+            self.canvas.itemconfigure(items['area'], state="normal" if is_valid_pile else "hidden")
+            items['valid'] = is_valid_pile
+        
+        lod = len(pile) > self.full_detail_max
+        if lod != items['lod']:
+            self.clear_cards(pile_index)
+            items['lod'] = lod
+        if lod:
+            self.draw_pile_lod(pile_index, pile)
+            return
         
-        # Dibujar cada carta de la pila
+        slots = items['slots']
+        drawn = items['drawn']
+        
+        # Actualizar solo las cartas que cambiaron
         for card_index, card in enumerate(pile):
+            shown = (card, card.face_up)
+            if card_index < len(drawn) and drawn[card_index] == shown:
+                continue
+            
             # Las cartas boca arriba se separan un poco más
             offset = card_index * (15 if card.face_up else 2)
             card_y = y + offset
             
-            is_top = card_index == len(pile) - 1
-            
-            card_tag = self.card_renderer.draw_card(x, card_y, card, pile_index, card_index, is_top)
+            if card_index < len(drawn):
+                self.card_renderer.update_card(slots[card_index], x, card_y, card)
+                drawn[card_index] = shown
+            else:
+                slots.append(self.card_renderer.create_card(x, card_y, card, pile_index, card_index))
+                self.restack(pile_index, card_index, f"card_{pile_index}_{card_index}")
+                drawn.append(shown)
+        
+        # Borrar las cartas que ya no están en la pila
+        while len(drawn) > len(pile):
+            drawn.pop()
+            slots.pop()
+            self.canvas.delete(f"card_{pile_index}_{len(drawn)}")
+    
+    def restack(self, pile_index, card_index, tag):
+        """
+        Pone elementos recién creados en el lugar que tendrían en un tablero nuevo
+        
+        El canvas dibuja lo último creado encima de todo; una carta agregada
+        después quedaría sobre las pilas siguientes y sobre una carta en vuelo.
+        Se sube justo encima del elemento que la precede: la carta anterior de
+        su pila, el bloque resumido o, para la primera, lo último de las pilas
+        anteriores (o las áreas de las pilas si aún no hay cartas).
+        
+        Args:
+            pile_index (int): Índice de la pila
+            card_index (int): Índice del elemento dibujado en la pila
+            tag (str): Etiqueta de los elementos creados
+        """
+        if self.building:
+            return
+        items = self.pile_items[pile_index]
+        below = None
+        if card_index:
+            below = items['slots'][card_index - 1][-1]
+        elif items['stack'] is not None and not tag.startswith("stack_"):
+            below = items['stack'][-1]
+        else:
+            for previous in reversed(self.pile_items[:pile_index]):
+                if previous['slots']:
+                    below = previous['slots'][-1][-1]
+                    break
+                if previous['stack'] is not None:
+                    below = previous['stack'][-1]
+                    break
+        if below is None:
+            below = self.pile_items[-1]['area']
+        self.canvas.tag_raise(tag, below)
+    
+    def clear_cards(self, pile_index):
+        """
+        Borra las cartas y el bloque dibujados de una pila, al cambiar de nivel de detalle
+        
+        Args:
+            pile_index (int): Índice de la pila
+        """
+        items = self.pile_items[pile_index]
+        for card_index in range(len(items['slots'])):
+            self.canvas.delete(f"card_{pile_index}_{card_index}")
+        items['slots'].clear()
+        items['drawn'].clear()
+        if items['stack'] is not None:
+            self.canvas.delete(f"stack_{pile_index}")
+            items['stack'] = None
+            items['stack_shown'] = None
+        items['base'] = 0
+    
+    def draw_pile_lod(self, pile_index, pile):
+        """
+        Actualiza una pila larga con nivel de detalle reducido
+        
+        Dibuja un bloque con las cartas de abajo y encima, completas, las
+        últimas cartas boca arriba (como mucho face_up_cards) o la superior
+        si está boca abajo. Los elementos del canvas no dependen del largo.
+        
+        Args:
+            pile_index (int): Índice de la pila
+            pile (list): Lista de cartas en la pila
+        """
+        x, y = PILE_POSITIONS[pile_index]
+        items = self.pile_items[pile_index]
+        
+        # Cartas completas: la racha final boca arriba, o la superior
+        shown_count = 1
+        if pile[-1].face_up:
+            while (shown_count < self.face_up_cards and shown_count < len(pile)
+                   and pile[-shown_count - 1].face_up):
+                shown_count += 1
+        base = len(pile) - shown_count
+        
+        if items['stack'] is None:
+            items['stack'] = self.card_renderer.create_stack(x, y, pile_index)
+            self.restack(pile_index, 0, f"stack_{pile_index}")
+        stack_shown = (base, sum(1 for card in pile[:base] if not card.face_up))
+        if stack_shown != items['stack_shown']:
+            self.card_renderer.update_stack(items['stack'], x, y, *stack_shown)
+            items['stack_shown'] = stack_shown
+        
+        top_y = y + self.stack_offset if base else y
+        slots = items['slots']
+        drawn = items['drawn']
+        moved = top_y != items['top_y']
+        items['base'] = base
+        items['top_y'] = top_y
+        
+        for slot_index in range(shown_count):
+            card = pile[base + slot_index]
+            shown = (card, card.face_up)
+            card_y = top_y + slot_index * 15
+            if slot_index < len(drawn):
+                if drawn[slot_index] != shown:
+                    self.card_renderer.update_card(slots[slot_index], x, card_y, card)
+                    drawn[slot_index] = shown
+                elif moved:
+                    self.card_renderer.move_card(slots[slot_index], x, card_y, card)
+            else:
+                slots.append(self.card_renderer.create_card(x, card_y, card, pile_index, slot_index))
+                self.restack(pile_index, slot_index, f"card_{pile_index}_{slot_index}")
+                drawn.append(shown)
+        
+        while len(drawn) > shown_count:
+            drawn.pop()
+            slots.pop()
+            self.canvas.delete(f"card_{pile_index}_{len(drawn)}")
+    
+    def card_items(self, pile_index, card_index):
+        """
+        Ids y posición de una carta dibujada, para animarla
+        
+        Args:
+            pile_index (int): Índice de la pila
+            card_index (int): Índice de la carta en la pila
             
-            # Si es la pila válida, hacer las cartas clickeables también
-            if is_valid_pile:
-                self.canvas.tag_bind(card_tag, "<Button-1>",
-                                   lambda e, p=pile_index: on_pile_click_callback(p) if on_pile_click_callback else None)
\ No newline at end of file
+        Returns:
+            tuple or None: (ids de la carta, x, y) o None si no está dibujada
+        """
+        if pile_index >= len(self.pile_items):
+            return None
+        items = self.pile_items[pile_index]
+        x, y = PILE_POSITIONS[pile_index]
+        if items['lod']:
+            # Las cartas resumidas en el bloque no tienen elementos propios
+            slot_index = card_index - items['base']
+            if not 0 <= slot_index < len(items['slots']):
+                return None
+            return items['slots'][slot_index], x, items['top_y'] + slot_index * 15
+        if card_index >= len(items['slots']):
+            return None
+        card, face_up = items['drawn'][card_index]
+        return items['slots'][card_index], x, y + card_index * (15 if face_up else 2)
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Contador de objetos del juego creados
+
+Card, las pilas que arma Deck y GameState anotan aquí cada objeto nuevo.
+Sirve para comprobar que reiniciar y volver a jugar reutiliza esos objetos:
+
+    before = allocations.snapshot()
+    controller.reset()
+    controller.start_game("pregunta")
+    assert not allocations.diff(before)
+
+Solo cubre esos tres tipos. Cada partida sigue creando temporales que el
+contador no ve: las listas y el diccionario card_bits que rehace
+GameState.set_piles, las tuplas de las pilas y las nuevas tuplas de cada
+colocación para las fotos del estado. Para medir todo lo asignado en
+Python está traced_memory, con tracemalloc:
+
+    retained, peak = allocations.traced_memory(reset_and_start, repeat=1000)
+"""
+import tracemalloc
+
+counts = {}
+
+
+def record(kind, amount=1):
+    """
+    Anota objetos creados
+
+    Args:
+        kind (str): Tipo de objeto ("card", "pile", "state")
+        amount (int): Cantidad creada
+    """
+    counts[kind] = counts.get(kind, 0) + amount
+
+
+def snapshot():
+    """
+    Copia de los contadores actuales
+
+    Returns:
+        dict: Objetos creados por tipo
+    """
+    return dict(counts)
+
+
+def diff(before):
+    """
+    Objetos creados desde una copia anterior
+
+    Args:
+        before (dict): Resultado de snapshot()
+
+    Returns:
+        dict: Objetos nuevos por tipo (solo los tipos con cambios)
+    """
+    return {kind: count - before.get(kind, 0)
+            for kind, count in counts.items() if count != before.get(kind, 0)}
+
+
+def traced_memory(function, repeat=100):
+    """
+    Memoria que asigna una función según tracemalloc
+
+    Se llama una vez antes de medir, para que no cuente lo que solo se crea
+    la primera vez. Si la función reutiliza sus objetos, lo retenido no crece
+    con repeat: queda lo que cada llamada reemplaza (por ejemplo card_bits
+    de la última partida, unos 4 KB). El pico incluye además los temporales
+    que se liberan enseguida.
+
+    Args:
+        function: Función sin argumentos, por ejemplo reiniciar y empezar
+        repeat (int): Llamadas medidas
+
+    Returns:
+        tuple: (bytes retenidos tras todas las llamadas, pico de bytes
+            sobre el inicio durante ellas)
+    """
+    function()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(repeat):
+            function()
+        current, peak = tracemalloc.get_traced_memory()
+        return current - before, peak - before
+    finally:
+        if started:
+            tracemalloc.stop()
@@ -0,0 +1,81 @@
+"""
+Caché LRU acotada por tamaño y por antigüedad
+"""
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    def __init__(self, max_size=1024, ttl=None, clock=time.monotonic):
+        """
+        Inicializa la caché vacía
+
+        Args:
+            max_size (int): Máximo de entradas; se descarta la menos usada
+            ttl (float): Segundos de vida de cada entrada (None para no vencer)
+            clock: Función que devuelve el instante actual en segundos
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        # Ordenadas de la menos a la más recientemente usada
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """
+        Busca una entrada vigente y la marca como recién usada
+
+        Args:
+            key: Clave a buscar
+            default: Valor si no está o venció
+
+        Returns:
+            El valor guardado o default
+        """
+        entry = self.entries.get(key)
+        if entry is None or (self.ttl is not None and self.clock() >= entry[1]):
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value):
+        """
+        Guarda una entrada, descartando la menos usada si no hay lugar
+
+        Args:
+            key: Clave
+            value: Valor a guardar
+        """
+        expires = self.clock() + self.ttl if self.ttl is not None else None
+        self.entries[key] = (value, expires)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def evict_expired(self):
+        """
+        Descarta las entradas vencidas
+
+        Returns:
+            int: Entradas descartadas
+        """
+        if self.ttl is None:
+            return 0
+        now = self.clock()
+        expired = [key for key, (_, expires) in self.entries.items() if now >= expires]
+        for key in expired:
+            del self.entries[key]
+        return len(expired)
+
+    def clear(self):
+        """Vacía la caché"""
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
@@ -1,6 +1,7 @@
 """
 Constantes del juego
 """
+import os
 
 # Colores del tema
 COLORS = {
@@ -55,6 +56,40 @@ WINDOW_HEIGHT = 900
 ANIMATION_TIMES = {
     'shuffle_wait': 2000,      # Tiempo de espera al mezclar
     'flip_delay': 400,         # Tiempo antes de voltear carta
-    'auto_play_delay': 500,    # Tiempo entre movimientos automáticos
-    'place_card_delay': 300    # Tiempo al colocar carta
-}
\ No newline at end of file
+    'place_card_delay': 300,   # Tiempo al colocar carta
+    'auto_play_frame': 120     # Tiempo entre cuadros de "Completar todo"
+}
+
+# Nivel de detalle de las pilas: las pilas más largas que full_detail_max
+# se dibujan como un bloque con la cantidad de cartas boca abajo y solo las
+# últimas face_up_cards cartas boca arriba (o la superior) completas
+RENDER_LOD = {
+    'full_detail_max': 8,
+    'face_up_cards': 4,
+    'stack_offset': 12         # Píxeles entre el bloque y la primera carta
+}
+
+# Cuadros por segundo del reloj de animación
+ANIMATION_FPS = 60
+
+# Modo de "Completar todo"
+AUTO_PLAY = {
+    'instant': False,          # True: saltar directo al resultado
+    'moves_per_frame': 4       # Colocaciones agrupadas en cada redibujado
+}
+
+# Configuración de la consulta
+NUM_PILES = 13       # Una pila por valor (A..K)
+CARDS_PER_PILE = 4   # Cartas por pila al distribuir
+CENTER_PILE = 12     # Pila central (la de los reyes), donde empieza el juego
+
+# Historial de consultas (SQLite)
+HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".oraculo_historial.db")
+
+# Modo de repartición determinada por la pregunta
+QUESTION_SEEDS = {
+    'enabled': False,          # True: la misma pregunta da la misma repartición
+    'daily_salt': True,        # True: la repartición cambia cada día
+    'cache_size': 1024,        # Reparticiones recordadas
+    'cache_ttl': 24 * 3600     # Segundos que se recuerda cada una
+}
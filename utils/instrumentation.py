@@ -0,0 +1,257 @@
+"""
+Instrumentación opcional: tiempos por método, eventos y perfiles
+
+Desactivada no cuesta nada: los métodos medidos son los originales de cada
+clase. Al activarla se reemplazan por envoltorios que acumulan el tiempo en
+un Timer ya resuelto (sin buscar en diccionarios en cada llamada) y avisan
+a los hooks registrados. Al desactivarla se restauran los originales.
+
+Variables de entorno (ver configure_from_env):
+    ORACULO_PROFILE         lista separada por comas: timing, cprofile, tracemalloc
+    ORACULO_PROFILE_OUTPUT  JSON donde volcar las métricas al salir
+                            (por defecto oraculo_profile.json)
+"""
+import atexit
+import functools
+import importlib
+import os
+import time
+
+ENV_MODES = "ORACULO_PROFILE"
+ENV_OUTPUT = "ORACULO_PROFILE_OUTPUT"
+DEFAULT_OUTPUT = "oraculo_profile.json"
+MODES = ("timing", "cprofile", "tracemalloc")
+TOP_ENTRIES = 30
+
+# Métodos medidos: (módulo, clase, método)
+TARGETS = [
+    ("controllers.game_controller", "GameController", "start_game"),
+    ("controllers.game_controller", "GameController", "flip_card"),
+    ("controllers.game_controller", "GameController", "place_card"),
+    ("controllers.game_controller", "GameController", "get_result"),
+    ("ui.pile_renderer", "PileRenderer", "draw_all_piles"),
+]
+
+
+class Timer:
+    __slots__ = ('calls', 'total', 'max')
+
+    def __init__(self):
+        """Inicializa los contadores de un método medido"""
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed):
+        """
+        Acumula una llamada
+
+        Args:
+            elapsed (float): Duración en segundos
+        """
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def to_dict(self):
+        """
+        Contadores en microsegundos
+
+        Returns:
+            dict: Llamadas, total, media y máximo
+        """
+        return {
+            'calls': self.calls,
+            'total_us': self.total * 1e6,
+            'mean_us': self.total / self.calls * 1e6 if self.calls else 0.0,
+            'max_us': self.max * 1e6,
+        }
+
+
+class Instrumentation:
+    def __init__(self, clock=time.perf_counter):
+        """
+        Inicializa la instrumentación, desactivada
+
+        Args:
+            clock: Función que devuelve el instante actual en segundos
+        """
+        self.clock = clock
+        self.timers = {}
+        self.hooks = []
+        # (clase, nombre del método, función original) de lo reemplazado
+        self.patched = []
+        self.profiler = None
+        self.tracing = False
+
+    @property
+    def enabled(self):
+        """bool: Si los métodos están envueltos"""
+        return bool(self.patched)
+
+    def add_hook(self, hook):
+        """
+        Registra una función llamada con (nombre, segundos) tras cada llamada medida
+
+        Args:
+            hook: Función a llamar
+        """
+        self.hooks.append(hook)
+
+    def wrap(self, name, function):
+        """Envuelve una función para medirla"""
+        timer = self.timers.setdefault(name, Timer())
+        add = timer.add
+        clock = self.clock
+        hooks = self.hooks
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                add(elapsed)
+                for hook in hooks:
+                    hook(name, elapsed)
+
+        return timed
+
+    def enable(self, targets=None):
+        """
+        Envuelve los métodos medidos
+
+        Args:
+            targets (list): Lista de (módulo, clase, método); por defecto TARGETS
+        """
+        if self.enabled:
+            return
+        for module_name, class_name, method_name in targets or TARGETS:
+            cls = getattr(importlib.import_module(module_name), class_name)
+            original = cls.__dict__[method_name]
+            self.patched.append((cls, method_name, original))
+            setattr(cls, method_name, self.wrap(f"{class_name}.{method_name}", original))
+
+    def disable(self):
+        """Restaura los métodos originales"""
+        for cls, method_name, original in reversed(self.patched):
+            setattr(cls, method_name, original)
+        self.patched.clear()
+
+    def reset(self):
+        """Pone a cero los contadores"""
+        # Los envoltorios instalados ya tienen su Timer: se vacían en su lugar
+        for timer in self.timers.values():
+            timer.calls = 0
+            timer.total = timer.max = 0.0
+
+    def start_profile(self, modes):
+        """
+        Arranca cProfile y/o tracemalloc
+
+        Args:
+            modes (set): Incluye "cprofile" y/o "tracemalloc"
+        """
+        if "cprofile" in modes and self.profiler is None:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if "tracemalloc" in modes:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self.tracing = True
+
+    def profile_report(self):
+        """Funciones con más tiempo acumulado según cProfile"""
+        import pstats
+
+        self.profiler.disable()
+        stats = pstats.Stats(self.profiler).stats
+        self.profiler.enable()
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_ENTRIES]
+        return [
+            {
+                'function': f"{filename}:{line}({function})",
+                'calls': calls,
+                'tottime_s': tottime,
+                'cumtime_s': cumtime,
+            }
+            for (filename, line, function), (_, calls, tottime, cumtime, _) in rows
+        ]
+
+    def memory_report(self):
+        """Líneas con más memoria asignada según tracemalloc"""
+        import tracemalloc
+
+        current, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ENTRIES]
+        return {
+            'current_bytes': current,
+            'peak_bytes': peak,
+            'top': [{'location': str(stat.traceback), 'bytes': stat.size, 'blocks': stat.count}
+                    for stat in top],
+        }
+
+    def to_dict(self):
+        """
+        Métricas acumuladas
+
+        Returns:
+            dict: Tiempos por método y, si están activos, perfil y memoria
+        """
+        report = {
+            'timestamp': time.time(),
+            'timers': {name: timer.to_dict() for name, timer in sorted(self.timers.items())},
+        }
+        if self.profiler is not None:
+            report['cprofile'] = self.profile_report()
+        if self.tracing:
+            report['tracemalloc'] = self.memory_report()
+        return report
+
+    def dump(self, path):
+        """
+        Guarda las métricas como JSON
+
+        Args:
+            path (str): Ruta del archivo
+        """
+        import json
+
+        with open(path, "w", encoding="utf-8") as report_file:
+            json.dump(self.to_dict(), report_file, indent=2)
+
+
+# Instancia compartida por la aplicación y las herramientas
+instrumentation = Instrumentation()
+
+
+def configure_from_env(environ=None):
+    """
+    Activa la instrumentación según ORACULO_PROFILE y vuelca al salir
+
+    Un modo desconocido produce ValueError en lugar de ignorarse.
+
+    Args:
+        environ (dict): Variables de entorno (por defecto os.environ)
+
+    Returns:
+        bool: True si se activó algo
+    """
+    environ = os.environ if environ is None else environ
+    modes = {mode.strip().lower() for mode in environ.get(ENV_MODES, "").split(",") if mode.strip()}
+    unknown = modes.difference(MODES)
+    if unknown:
+        raise ValueError(f"{ENV_MODES}: modo desconocido {', '.join(sorted(unknown))} "
+                         f"(válidos: {', '.join(MODES)})")
+    if not modes:
+        return False
+    # Solo timing envuelve los métodos; con cprofile solo sesgaría el perfil
+    if "timing" in modes:
+        instrumentation.enable()
+    instrumentation.start_profile(modes)
+    atexit.register(instrumentation.dump, environ.get(ENV_OUTPUT, DEFAULT_OUTPUT))
+    return True
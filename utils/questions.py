@@ -0,0 +1,55 @@
+"""
+Normalización de preguntas y semillas derivadas de ellas
+
+Se importa al arrancar GameController, así que evita módulos de carga lenta
+(re, datetime) y difiere hashlib hasta que se pide una semilla.
+"""
+import time
+import unicodedata
+
+
+def normalize_question(question):
+    """
+    Clave de búsqueda de una pregunta
+
+    Ignora mayúsculas, tildes, signos de puntuación y espacios repetidos,
+    para que "¿Me irá bien?" y "me ira bien" se encuentren igual.
+
+    Args:
+        question (str): La pregunta tal como se escribió
+
+    Returns:
+        str: La pregunta normalizada
+    """
+    decomposed = unicodedata.normalize("NFKD", question.casefold())
+    text = "".join(char if char.isalnum() or char.isspace() else " "
+                   for char in decomposed if not unicodedata.combining(char))
+    return " ".join(text.split())
+
+
+def question_seed(question, salt=None):
+    """
+    Semilla de mezcla determinada por la pregunta
+
+    Args:
+        question (str): La pregunta (se normaliza antes de calcular)
+        salt (str): Texto opcional que cambia la semilla, como la fecha
+
+    Returns:
+        int: Semilla de 64 bits
+    """
+    import hashlib
+
+    key = normalize_question(question) if salt is None else f"{salt}\n{normalize_question(question)}"
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def daily_salt():
+    """
+    Sal que cambia cada día, para que la misma pregunta varíe entre días
+
+    Returns:
+        str: Fecha local en formato ISO
+    """
+    return time.strftime("%Y-%m-%d")
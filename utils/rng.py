@@ -0,0 +1,91 @@
+"""
+Generadores de números aleatorios intercambiables para mezclar la baraja
+
+Cualquier objeto con un método shuffle(secuencia) sirve como generador. Los
+que además tienen permutations(cantidad, tamaño) pueden producir muchas
+mezclas de una sola vez, sin pasar por Python en cada intercambio.
+"""
+import random
+
+
+def make_rng(rng=None):
+    """
+    Normaliza el generador recibido por Deck y GameController
+
+    Args:
+        rng: None (generador global de random), una semilla entera o un
+            objeto con método shuffle
+
+    Returns:
+        Objeto con método shuffle
+    """
+    if rng is None:
+        return random
+    if isinstance(rng, int) and not isinstance(rng, bool):
+        return random.Random(rng)
+    if not hasattr(rng, "shuffle"):
+        raise TypeError(f"Generador no válido: {rng!r}")
+    return rng
+
+
+class NumpyRandom:
+    def __init__(self, seed=None):
+        """
+        Inicializa un generador PCG64 de NumPy
+
+        Args:
+            seed (int): Semilla del generador
+        """
+        try:
+            import numpy
+        except ImportError as exc:
+            raise ImportError("NumpyRandom requiere tener numpy instalado") from exc
+        self.numpy = numpy
+        self.generator = numpy.random.Generator(numpy.random.PCG64(seed))
+
+    def shuffle(self, seq):
+        """
+        Mezcla una secuencia mutable en su lugar
+
+        Args:
+            seq: Lista o bytearray a mezclar
+        """
+        items = list(seq)
+        seq[:] = [items[i] for i in self.generator.permutation(len(items)).tolist()]
+
+    def permutations(self, count, size):
+        """
+        Genera muchas permutaciones de una sola vez
+
+        Args:
+            count (int): Número de permutaciones
+            size (int): Tamaño de cada permutación
+
+        Returns:
+            numpy.ndarray: Matriz (count, size); cada fila permuta range(size)
+        """
+        numpy = self.numpy
+        rows = numpy.broadcast_to(numpy.arange(size, dtype=numpy.int16), (count, size))
+        return self.generator.permuted(rows, axis=1)
+
+
+BACKENDS = {
+    "random": random.Random,
+    "numpy": NumpyRandom,
+}
+
+
+def create_rng(seed=None, backend="random"):
+    """
+    Crea un generador del tipo indicado
+
+    Args:
+        seed (int): Semilla del generador
+        backend (str): "random" (biblioteca estándar) o "numpy"
+
+    Returns:
+        Objeto con método shuffle
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Generador desconocido: {backend}")
+    return BACKENDS[backend](seed)